@@ -1,10 +1,29 @@
 # app/config.py
 
+import os
+import time
 from pathlib import Path
 
+__all__ = [
+    "ROOT_DIR", "APP_DIR",
+    "LOGS_DIR", "TEST_LOGS_DIR", "ARCHIVE_LOG_DIR", "CURRENT_LOG_DIR",
+    "OUTPUT_JSON", "STATE_SNAPSHOT_JSON", "ALL_TIME_PLAYERS_JSON", "SIMULATED_LOG_FILE",
+    "LOGO_FOLDER_PATH", "ADJACENT_LOGO_FOLDER_PATH", "DEFAULT_TEAM_LOGO",
+    "DEFAULT_PLAYER_PHOTO", "PLAYER_PHOTOS_FOLDER", "ADJACENT_PLAYER_PHOTOS_PATH",
+    "TEAM_CONFIG_FILE",
+    "UPDATE_INTERVAL", "FILE_CHECK_INTERVAL", "SIMULATION_SPEED", "SIMULATION_CHUNK_SIZE",
+    "PLACEMENT_POINTS", "PLACEMENT_POINTS_TABLE", "placement_points",
+    "WEB_SERVER_PORT", "WEB_SERVER_HOST",
+    "LOG_LEVEL", "LOG_FORMAT",
+    "PRETTY_JSON", "PROFILE_OUTPUT",
+    "VALIDATE_CACHE_TTL", "TEAM_CONFIG_CACHE_TTL",
+    "ensure_directories", "validate_config", "reload_config",
+]
+
 # ---------- Directory Configuration ----------
-ROOT_DIR = Path(__file__).parent.parent  # Go up one level from app/ to project root
-APP_DIR = Path(__file__).parent
+# Resolved once so derived paths are absolute and never carry ".." segments
+APP_DIR = Path(__file__).resolve().parent
+ROOT_DIR = APP_DIR.parent  # Go up one level from app/ to project root
 
 # Log directories
 LOGS_DIR = ROOT_DIR / "logs"
@@ -14,20 +33,23 @@ CURRENT_LOG_DIR = ROOT_DIR  # Live monitor looks in project root
 
 # Output files
 OUTPUT_JSON = ROOT_DIR / "live_scoreboard.json"
+STATE_SNAPSHOT_JSON = ROOT_DIR / "state_snapshot.json"  # Full state written at finalization
 ALL_TIME_PLAYERS_JSON = ROOT_DIR / "all_time_players.json"
 SIMULATED_LOG_FILE = ROOT_DIR / "simulated_live.txt"
 
 # Asset paths
 LOGO_FOLDER_PATH = ROOT_DIR / "assets" / "LOGO"
-ADJACENT_LOGO_FOLDER_PATH = "/assets/LOGO/"  # Changed to relative path
-DEFAULT_TEAM_LOGO = "/assets/default-team-logo.jpg"  # Changed to relative path
-DEFAULT_PLAYER_PHOTO = "/assets/PUBG.png"  # Changed to relative path
 PLAYER_PHOTOS_FOLDER = ROOT_DIR / "assets" / "Players"
-ADJACENT_PLAYER_PHOTOS_PATH = "/assets/Players/"
 
 # Team configuration
 TEAM_CONFIG_FILE = ROOT_DIR / "TeamLogoAndColor.ini"
 
+# Asset URLs
+ADJACENT_LOGO_FOLDER_PATH = "/assets/LOGO/"  # Changed to relative path
+DEFAULT_TEAM_LOGO = "/assets/default-team-logo.jpg"  # Changed to relative path
+DEFAULT_PLAYER_PHOTO = "/assets/PUBG.png"  # Changed to relative path
+ADJACENT_PLAYER_PHOTOS_PATH = "/assets/Players/"
+
 # ---------- Timing Configuration ----------
 UPDATE_INTERVAL = 0.5  # How often to update JSON output
 FILE_CHECK_INTERVAL = 0.1  # How often to check for file changes
@@ -36,6 +58,12 @@ SIMULATION_CHUNK_SIZE = 1  # How many log blocks to write at once
 
 # ---------- Game Configuration ----------
 PLACEMENT_POINTS = {1: 10, 2: 6, 3: 5, 4: 4, 5: 3, 6: 2, 7: 1, 8: 1}
+# Same table indexed directly by rank (index 0 unused)
+PLACEMENT_POINTS_TABLE = (0, 10, 6, 5, 4, 3, 2, 1, 1)
+
+def placement_points(rank):
+    """Return the placement points awarded for a finishing rank (0 if unranked)."""
+    return PLACEMENT_POINTS_TABLE[rank] if 1 <= rank <= 8 else 0
 
 # ---------- Server Configuration ----------
 WEB_SERVER_PORT = 5000
@@ -45,34 +73,96 @@ WEB_SERVER_HOST = "0.0.0.0"  # Changed to allow network access
 LOG_LEVEL = "INFO"
 LOG_FORMAT = "%(asctime)s %(levelname)s %(message)s"
 
+# ---------- Output Configuration ----------
+# JSON files are written compact; set PUBG_PRETTY_JSON=1 for indented output
+PRETTY_JSON = os.getenv("PUBG_PRETTY_JSON", "") not in ("", "0")
+
+# ---------- Profiling ----------
+# Set PUBG_PROFILE to a file path to record cProfile stats for the live loop
+PROFILE_OUTPUT = os.getenv("PUBG_PROFILE") or None
+
 # ---------- Create Required Directories ----------
+_dirs_ready = set()  # Directories already created during this process
+
 def ensure_directories():
-    """Create all required directories if they don't exist."""
+    """Create all required directories if they don't exist (once per process)."""
+    global _team_cfg_cache
+    # Leaf directories only: mkdir(parents=True) also creates LOGS_DIR
+    # (== ARCHIVE_LOG_DIR) and LOGO_FOLDER_PATH.parent on the way down.
     directories = [
-        LOGS_DIR,
         TEST_LOGS_DIR,
-        ARCHIVE_LOG_DIR,
-        LOGO_FOLDER_PATH.parent,
         LOGO_FOLDER_PATH,
         PLAYER_PHOTOS_FOLDER
     ]
     
     for directory in directories:
+        if directory in _dirs_ready:
+            continue
         directory.mkdir(parents=True, exist_ok=True)
+        _dirs_ready.add(directory)
+        _team_cfg_cache = None  # Filesystem layout may have changed
 
 # ---------- Validation ----------
+VALIDATE_CACHE_TTL = 5.0  # Seconds a validate_config() result is considered fresh
+TEAM_CONFIG_CACHE_TTL = 2.0  # Seconds a TEAM_CONFIG_FILE existence check is reused
+
+_validate_cache = None  # (monotonic timestamp, issues) from the last check
+_team_cfg_cache = None  # (monotonic timestamp, exists) for TEAM_CONFIG_FILE
+
 def validate_config():
-    """Validate that all required directories and files are accessible."""
+    """Validate that all required directories and files are accessible.
+
+    Results are cached for VALIDATE_CACHE_TTL seconds.
+    """
+    global _validate_cache
+    now = time.monotonic()
+    if _validate_cache is not None and now - _validate_cache[0] < VALIDATE_CACHE_TTL:
+        return list(_validate_cache[1])
+    issues = _check_config()
+    _validate_cache = (now, issues)
+    return list(issues)
+
+def _team_cfg_exists():
+    """Return whether TEAM_CONFIG_FILE exists, re-statting at most every TEAM_CONFIG_CACHE_TTL seconds."""
+    global _team_cfg_cache
+    now = time.monotonic()
+    if _team_cfg_cache is not None and now - _team_cfg_cache[0] < TEAM_CONFIG_CACHE_TTL:
+        return _team_cfg_cache[1]
+    try:
+        os.stat(TEAM_CONFIG_FILE)
+        exists = True
+    except FileNotFoundError:
+        exists = False
+    _team_cfg_cache = (now, exists)
+    return exists
+
+def reload_config():
+    """Drop all cached filesystem checks so the next calls hit the disk again."""
+    global _validate_cache, _team_cfg_cache
+    _validate_cache = None
+    _team_cfg_cache = None
+    _dirs_ready.clear()
+
+def _check_config():
+    """Run the actual directory and file checks behind validate_config()."""
     ensure_directories()
     
     issues = []
     
-    # Check if test logs directory has any files
-    if not any(TEST_LOGS_DIR.glob("*.txt")):
-        issues.append(f"No test log files found in {TEST_LOGS_DIR}")
+    # Check if test logs directory has any files (stops at the first .txt hit)
+    test_logs_dir = TEST_LOGS_DIR
+    has_test_logs = False
+    if os.path.isdir(test_logs_dir):
+        with os.scandir(test_logs_dir) as entries:
+            has_test_logs = any(
+                e.name.endswith(".txt") and e.is_file(follow_symlinks=False)
+                for e in entries
+            )
+    if not has_test_logs:
+        issues.append(f"No test log files found in {test_logs_dir}")
     
     # Check if team config file exists
-    if not TEAM_CONFIG_FILE.exists():
+    if not _team_cfg_exists():
         issues.append(f"Team config file not found: {TEAM_CONFIG_FILE}")
     
     return issues
\ No newline at end of file
@@ -1,15 +1,25 @@
+import atexit
+import contextlib
+import io
 import json
 import re
 import time
 import datetime
+import functools
+import heapq
 import os
 import logging
+import logging.handlers
+import queue
 import threading
 from pathlib import Path
 from config import *
 from log_simulator import SimulationManager
-import copy
 import signal
+import sys
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 
 try:
     from colorama import init, Fore, Back, Style
@@ -24,6 +34,19 @@ except ImportError:
     class Style:
         BRIGHT = DIM = NORMAL = RESET_ALL = ""
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import PatternMatchingEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
 try:
     import webserver
     WEBSERVER_AVAILABLE = True
@@ -34,14 +57,56 @@ except ImportError:
 # Setup logging
 logging.basicConfig(level=getattr(logging, LOG_LEVEL), format=LOG_FORMAT)
 
+def _log_output_filter(record):
+    """Log lines share the terminal with the scoreboard; make its next frame a full redraw."""
+    _mark_terminal_dirty()
+    return True
+
+def setup_logging():
+    """Move the root handlers behind a queue (once per process; called by main).
+
+    Callers only enqueue records; a listener thread formats and writes them,
+    so the live loop never blocks on console or file I/O.
+    """
+    root_logger = logging.getLogger()
+    if any(isinstance(h, logging.handlers.QueueHandler) for h in root_logger.handlers):
+        return
+    handlers = list(root_logger.handlers)
+    for handler in handlers:
+        handler.addFilter(_log_output_filter)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+
+# Number of recent kill messages kept in current_match["killFeed"]
+KILL_FEED_SIZE = 5
+# Archived logs scanned ahead on background threads while the current one is parsed
+ARCHIVE_READ_AHEAD = 4
+# Characters read per step when streaming an archived log
+ARCHIVE_CHUNK_SIZE = 4 * 1024 * 1024
+
 # Global simulation manager
 simulation_manager = None
 
 # Global buffer for chunk processing
 buffer = ''
+# Timestamp shared by state updates within one parse_and_apply call (None outside it)
+_tick_now = None
 in_archive_processing = False
 in_catchup_processing = False
 
+# Set by the file watchers (when watchdog is installed) on log / flag file changes.
+# Each consumer clears its own event, so the flag watchers set one per consumer:
+# flag_event for check_shutdown_conditions, listener_flag_event for force_end_listener.
+log_event = threading.Event()
+flag_event = threading.Event()
+listener_flag_event = threading.Event()
+# Set to have the sampler thread export ahead of its next tick (see _request_export)
+export_event = threading.Event()
+_sampler_active = False
+
 # Global shutdown control variables
 shutdown_event = threading.Event()
 finalization_requested = False
@@ -49,6 +114,9 @@ complete_shutdown_requested = False
 finalization_lock = threading.Lock()
 signal_received = False
 
+# Held by the live loop while it mutates state and by the sampler thread while it reads it
+state_lock = threading.RLock()
+
 # Global set to track processed files
 processed_files = set()
 
@@ -69,12 +137,15 @@ state = {
         "winnerTeamId": None,
         "winnerTeamName": None,
         "eliminationOrder": [],
-        "killFeed": [],
+        "killFeed": deque(maxlen=KILL_FEED_SIZE),
         "teams": {},
-        "players": {}
+        "players": {},
+        "_nameIndex": {},  # player name -> player id, for death lookups
+        "_aliveTeams": 0  # teams with liveMembers > 0, kept by _recalculate_live_members
     },
     "matches": [],  # List of completed matches
     "teamNameMapping": {},
+    "teamNameMapping_reverse": {},  # match id -> {team name: team id}
     "processed_matches": set(),  # Track processed GameIDs
     "match_history": [],  # Deprecated, use "matches"
     "match_state": {
@@ -83,13 +154,103 @@ state = {
     }
 }
 
-def print_colored(text, color=Fore.WHITE, style=Style.NORMAL, end="\n"):
-    """Print colored text if colorama is available."""
+# Generation counters per state bucket; bumped whenever that part of the state changes
+_state_gen = {"phase": 0, "all_time": 0, "match": 0}
+# Derived-view function name -> (generation it was computed at, result)
+_gen_cache = {}
+
+def _bump_gen(*buckets):
+    """Mark state buckets as changed (all of them when none are given)."""
+    for bucket in buckets or _state_gen:
+        _state_gen[bucket] += 1
+
+def _cached_for_gen(bucket):
+    """Reuse a derived view's last result until its state bucket changes."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper():
+            gen = _state_gen[bucket]
+            cached = _gen_cache.get(func.__name__)
+            if cached is not None and cached[0] == gen:
+                return cached[1]
+            result = func()
+            _gen_cache[func.__name__] = (gen, result)
+            return result
+        return wrapper
+    return decorator
+
+def _colored(text, color=Fore.WHITE, style=Style.NORMAL, end="\n"):
+    """Return text wrapped in color codes (plain text without colorama), as print_colored writes it."""
+    if COLORAMA_AVAILABLE:
+        return f"{style}{color}{text}{Style.RESET_ALL}{end}"
+    return f"{text}{end}"
+
+def print_colored(text, color=Fore.WHITE, style=Style.NORMAL, end="\n", buf=None):
+    """Print colored text if colorama is available.
+
+    If buf is given, the text is written to that buffer instead of stdout.
+    """
+    if buf is not None:
+        buf.write(_colored(text, color, style, end))
+        return
+    _mark_terminal_dirty()  # The scoreboard on screen has scrolled; redraw it in full next time
     if COLORAMA_AVAILABLE:
         print(f"{style}{color}{text}{Style.RESET_ALL}", end=end)
     else:
         print(text, end=end)
 
+# Clear screen and move the cursor home; replaces spawning `clear` every frame
+_CLEAR_SCREEN = "\x1b[2J\x1b[H"
+# Lines of the scoreboard frame currently on screen (None forces a full redraw)
+_frame_lines = None
+# Counts terminal writes other than scoreboard frames. The sampler stores a frame's lines
+# only if no such write happened while it drew, since those rows may have scrolled.
+_terminal_writes = 0
+_frame_lock = threading.Lock()
+
+def _mark_terminal_dirty():
+    """Record a non-scoreboard terminal write; the next frame is a full redraw."""
+    global _frame_lines, _terminal_writes
+    with _frame_lock:
+        _frame_lines = None
+        _terminal_writes += 1
+
+class _TrackedStream:
+    """Proxy for sys.stdout / sys.stderr that marks the terminal dirty on every write.
+
+    Catches plain print() output (the simulator, the web server) that never goes
+    through print_colored or logging.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        if text:
+            _mark_terminal_dirty()
+        return self.stream.write(text)
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+# Static lines of the terminal scoreboard frame (58 columns inside the box),
+# with their color codes and newline already applied
+_TOP_BORDER = _colored("╔" + "═" * 58 + "╗", Fore.BLUE)
+_MID_BORDER = _colored("╠" + "═" * 58 + "╣", Fore.BLUE)
+_BOTTOM_BORDER = _colored("╚" + "═" * 58 + "╝", Fore.BLUE)
+_ROW_RULE = _colored("║" + "─" * 58 + "║", Fore.BLUE)
+_BLANK_ROW = _colored("║" + " " * 58 + "║")
+_TITLE_ROW = _colored(f"║{' ' * 20}PUBG LIVE SCOREBOARD{' ' * 19}║", Fore.CYAN, Style.BRIGHT)
+_TEAMS_ROW = _colored("║ TEAMS" + " " * 53 + "║", Fore.CYAN, Style.BRIGHT)
+_TEAMS_HEADER_ROW = _colored("║ Team Name              Kills  Live  Points         ║", Fore.WHITE, Style.DIM)
+_KILLS_ROW = _colored("║ RECENT KILLS" + " " * 46 + "║", Fore.RED, Style.BRIGHT)
+# test_mode -> (mode text, mode color, padding after the clock)
+_MODE_DISPLAY = {
+    True: ("TEST MODE", Fore.YELLOW, " " * (42 - len("TEST MODE"))),
+    False: ("LIVE MODE", Fore.GREEN, " " * (42 - len("LIVE MODE"))),
+}
+# Color per team row in the top-8 table
+_RANK_COLORS = (Fore.YELLOW, Fore.GREEN, Fore.GREEN) + (Fore.WHITE,) * 5
+
 def print_status_header(mode="Production"):
     """Print a status header with current mode."""
     status_color = Fore.GREEN if mode == "Production" else Fore.YELLOW
@@ -137,19 +298,31 @@ def print_progress_bar(current, total, bar_length=50, prefix="Progress", suffix=
 
 # ---------- Parsing Functions ----------
 INI_BLOCK = re.compile(r'\[/Script/ShadowTrackerExtra.FCustomTeamLogoAndColor](.*?)\n\n', re.DOTALL)
+INI_TEAM_LINE = re.compile(r'TeamLogoAndColor=\(TeamNo=(\d+),TeamName=([^,]+),TeamLogoPath=([^,]+)')
 OBJ_BLOCKS = re.compile(r'(TotalPlayerList:|TeamInfoList:)')
 OBJ_KV = re.compile(r'(\w+):\s*(?:"([^"]*)"|\'([^\']*)\'|([^{},\n]+))')
+OBJ_BRACE = re.compile(r'\{[^{}]*\}')
+GAME_ID = re.compile(r"GameID:\s*['\"]?(\d+)['\"]?")
+SNAPSHOT_HEADER = re.compile(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] POST /totalmessage')
+# Literal tail of SNAPSHOT_HEADER and the length of the "[YYYY-MM-DD HH:MM:SS" before it
+SNAPSHOT_MARK = "] POST /totalmessage"
+SNAPSHOT_STAMP_LEN = 20
+# G_PlayerDied / PlayerDied / Death lines; fields never span lines and the gaps
+# between them are bounded so long non-matching lines cannot backtrack quadratically
+DEATH_LINE = re.compile(r'(?:G_PlayerDied|PlayerDied|Death)[^\n]{0,256}?(?:PlayerName|Name|Player)=([^,\n]+)[^\n]{0,256}?Health=([^,\n]+)')
+# First player object of a TotalPlayerList block
+PLAYER_LIST_ENTRY = re.compile(r'TotalPlayerList:[^{]{0,64}\{[^{}]*?\buId\b')
+
+def _top_player_key(p):
+    """Sort key for top players: kills, then damage, then knockouts."""
+    stats = p.get("stats", {})
+    return (stats.get("kills", 0), stats.get("damage", 0), stats.get("knockouts", 0))
 
 def _calculate_top_players(players_dict, teams_dict):
     """Calculates and returns the top players for the match, sorted by kills."""
     top_players = []
-    all_players = list(players_dict.values())
-    all_players.sort(key=lambda p: (
-        p.get("stats", {}).get("kills", 0),
-        p.get("stats", {}).get("damage", 0),
-        p.get("stats", {}).get("knockouts", 0)
-    ), reverse=True)
-    for player in all_players[:5]:
+    # nlargest keeps sorted(..., reverse=True)[:5] ordering without sorting everyone
+    for player in heapq.nlargest(5, players_dict.values(), key=_top_player_key):
         player_stats = player.get("stats", {})
         team_id = player.get("teamId")
         team_name = teams_dict.get(team_id, {}).get("name", "Unknown Team")
@@ -164,11 +337,38 @@ def _calculate_top_players(players_dict, teams_dict):
         })
     return top_players
 
+# current_match bookkeeping that is never stored with a finished match
+_LIVE_ONLY_KEYS = frozenset({"_nameIndex", "_aliveTeams"})
+
+def _finished_match_data(m):
+    """A current_match dict in the shape stored with the finished matches.
+
+    Finalization always ends by replacing state["current_match"] with a fresh dict, so
+    the teams and players are handed over rather than copied; only the live-only keys
+    are left out and the killFeed deque becomes a list.
+    """
+    data = {k: v for k, v in m.items() if k not in _LIVE_ONLY_KEYS}
+    data["killFeed"] = list(m.get("killFeed", []))
+    return data
+
+def _relative_logo_teams(teams):
+    """Copy of a teams dict with localhost prefixes stripped from logo URLs.
+
+    Only teams whose logo changes are copied; the rest are shared.
+    """
+    out = {}
+    for tid, team in teams.items():
+        logo = team.get("logo")
+        if logo and logo.startswith("http://"):
+            team = {**team, "logo": logo.replace("http://localhost:5000", "")}
+        out[tid] = team
+    return out
+
 def _finalize_and_persist():
     global state
     if state["current_match"]["id"] and state["match_state"]["status"] == "live":
         logging.info(f"Finalizing and persisting match ID: {state['current_match']['id']}")
-        final_match_data = copy.deepcopy(state["current_match"])
+        final_match_data = _finished_match_data(state["current_match"])
         end_match_and_update_phase(final_match_data)
         # The line above handles the full reset via _reset_current_match().
         # Removed the redundant and incomplete manual reset block here.
@@ -179,46 +379,93 @@ def _finalize_and_persist():
             # Use the comprehensive reset function when no match is active.
             _reset_current_match() 
             
-    # Write state to JSON with relative paths
-    json_file_path = os.path.join(PROJECT_ROOT, 'live_scoreboard.json')
-    state_copy = copy.deepcopy(state)
+    # Write the full state to its own file; OUTPUT_JSON holds the overlay view
+    json_file_path = STATE_SNAPSHOT_JSON
+    # Shallow copies are enough: only team logos and the killFeed are rewritten
+    cm = state["current_match"]
+    state_copy = dict(state)
+    state_copy["current_match"] = {k: v for k, v in cm.items() if k not in _LIVE_ONLY_KEYS}
+    state_copy["current_match"]["killFeed"] = list(cm.get("killFeed", []))
     # Strip any localhost prefixes
-    for team in state_copy["current_match"]["teams"].values():
-        if team.get("logo") and team["logo"].startswith("http://"):
-            team["logo"] = team["logo"].replace("http://localhost:5000", "")
-    for team in state_copy["phase"]["teams"].values():
-        if team.get("logo") and team["logo"].startswith("http://"):
-            team["logo"] = team["logo"].replace("http://localhost:5000", "")
-    for match in state_copy.get("matches", []):
-        for team in match.get("teams", {}).values():
-            if team.get("logo") and team["logo"].startswith("http://"):
-                team["logo"] = team["logo"].replace("http://localhost:5000", "")
+    state_copy["current_match"]["teams"] = _relative_logo_teams(cm["teams"])
+    state_copy["phase"] = {**state["phase"], "teams": _relative_logo_teams(state["phase"]["teams"])}
+    state_copy["matches"] = [
+        {**match, "teams": _relative_logo_teams(match.get("teams", {}))}
+        for match in state.get("matches", [])
+    ]
     try:
-        with open(json_file_path, 'w', encoding='utf-8') as f:
-            json.dump(state_copy, f, indent=2)
+        _write_bytes(json_file_path, _json_bytes(state_copy, _JSON_INDENT))
         logging.info(f"Persisted state to {json_file_path}")
     except Exception as e:
         logging.error(f"Failed to write JSON: {e}")
 
+def _iter_list_objects(text):
+    """Yield (marker, object text) for every {...} object after a list marker.
+
+    Scans text in place with bounded finditer calls instead of splitting it
+    into segments first.
+    """
+    markers = list(OBJ_BLOCKS.finditer(text))
+    for i, m in enumerate(markers):
+        end = markers[i + 1].start() if i + 1 < len(markers) else len(text)
+        marker = m.group(1)
+        for obj in OBJ_BRACE.finditer(text, m.end(), end):
+            yield marker, obj.group(0)
+
+# Literal tokens recognised by _parse_kv_object (all at most 5 characters)
+_KV_LITERALS = {"null": None, "none": None, "": None, "true": True, "false": False}
+_NUMERIC_START = frozenset("0123456789-.")
+_NUMERIC_END = frozenset("0123456789.")
+
+# Raw value text -> parsed value; snapshots repeat the same few values (0, 100, null, ...)
+_KV_VALUE_CACHE = {}
+_KV_VALUE_CACHE_MAX = 4096
+# Object text -> parsed dict; most player/team objects are byte-identical between snapshots
+_KV_OBJECT_CACHE = {}
+_KV_OBJECT_CACHE_MAX = 4096
+
+def _kv_value(raw):
+    raw = raw.strip()
+    if len(raw) <= 5:
+        literal = _KV_LITERALS.get(raw.lower(), _KV_LITERALS)
+        if literal is not _KV_LITERALS:
+            return literal
+    # int()/float() also accept exponents and digit separators ("1e5", "1_000"), which the
+    # log never uses for numbers; those stay strings
+    if (raw[0] in _NUMERIC_START and raw[-1] in _NUMERIC_END
+            and "_" not in raw and "e" not in raw and "E" not in raw):
+        # Most fields are plain ints; fall back to float, then to the raw string
+        try:
+            return int(raw)
+        except ValueError:
+            try:
+                return float(raw)
+            except ValueError:
+                return raw
+    return raw
+
 def _parse_kv_object(text):
+    # Callers may modify the result, so hand out a copy of the cached dict
+    cached = _KV_OBJECT_CACHE.get(text)
+    if cached is not None:
+        return dict(cached)
     obj = {}
-    pairs = OBJ_KV.findall(text)
-    for key, v1, v2, v3 in pairs:
-        raw = (v1 or v2 or v3 or "").strip()
-        if raw.lower() in ("null", "none", ""):
-            val = None
-        elif raw.lower() == "true":
-            val = True
-        elif raw.lower() == "false":
-            val = False
-        elif raw.replace('.', '', 1).replace('-', '', 1).isdigit():
-            val = float(raw) if '.' in raw else int(raw)
-            if key == "teamId":
-                val = str(val)
-        else:
-            val = raw
+    cache = _KV_VALUE_CACHE
+    for key, v1, v2, v3 in OBJ_KV.findall(text):
+        raw = v1 or v2 or v3 or ""
+        try:
+            val = cache[raw]
+        except KeyError:
+            if len(cache) >= _KV_VALUE_CACHE_MAX:
+                cache.clear()
+            val = cache[raw] = _kv_value(raw)
+        if key == "teamId" and type(val) in (int, float):
+            val = str(val)
         obj[key] = val
-    return obj
+    if len(_KV_OBJECT_CACHE) >= _KV_OBJECT_CACHE_MAX:
+        _KV_OBJECT_CACHE.clear()
+    _KV_OBJECT_CACHE[text] = obj
+    return dict(obj)
 
 def _parse_ini(config_string):
     import os
@@ -234,7 +481,7 @@ def _parse_ini(config_string):
     os.makedirs(target_dir, exist_ok=True)
 
     for line in config_string.strip().splitlines():
-        m = re.search(r'TeamLogoAndColor=\(TeamNo=(\d+),TeamName=([^,]+),TeamLogoPath=([^,]+)', line)
+        m = INI_TEAM_LINE.search(line)
         if not m:
             continue
 
@@ -271,17 +518,21 @@ def _parse_ini(config_string):
 
     return teams
 
-def _calculate_missing_teams():
-    """Calculate missing teams for current match based on expected_teams."""
-    if not expected_teams or not state["current_match"]["id"]:
-        return []
-    
-    # Get current match team names (case-insensitive)
-    match_team_names = {t.get("name", "").lower() for t in state["current_match"]["teams"].values()}
-    
+# (expected_teams dict, [(lowercased name, name, info), ...]); expected_teams is
+# replaced rather than mutated, so a new dict means the list must be rebuilt
+_expected_teams_lower = (None, [])
+
+def _missing_teams(teams):
+    """Return placeholder entries for expected teams absent from a match's teams dict."""
+    global _expected_teams_lower
+    if _expected_teams_lower[0] is not expected_teams:
+        _expected_teams_lower = (expected_teams, [(name.lower(), name, info) for name, info in expected_teams.items()])
+    # Match team names (case-insensitive)
+    match_team_names = {t.get("name", "").lower() for t in teams.values()}
+
     missing = []
-    for team_name, info in expected_teams.items():
-        if team_name.lower() not in match_team_names:
+    for lower_name, team_name, info in _expected_teams_lower[1]:
+        if lower_name not in match_team_names:
             missing.append({
                 "id": info["id"],
                 "name": team_name,
@@ -294,9 +545,15 @@ def _calculate_missing_teams():
                 "players": [],
                 "missing": True
             })
-    
+
     return missing
 
+def _calculate_missing_teams():
+    """Calculate missing teams for current match based on expected_teams."""
+    if not expected_teams or not state["current_match"]["id"]:
+        return []
+    return _missing_teams(state["current_match"]["teams"])
+
 def get_team_logos(ini_file_path):
     try:
         with open(ini_file_path, "r", encoding="utf-8") as fh:
@@ -326,25 +583,78 @@ def get_team_logos(ini_file_path):
         logging.error(f"Error parsing INI file: {e}")
     return {}
 
+# Lowercase file name -> real file name in LOGO_FOLDER_PATH, rebuilt when the folder mtime changes
+_LOGO_CACHE = {"mtime": None, "map": {}}
+
+def _logo_name_map():
+    """Return the cached case-insensitive listing of LOGO_FOLDER_PATH."""
+    try:
+        mtime = LOGO_FOLDER_PATH.stat().st_mtime
+    except OSError:
+        return {}
+    if mtime != _LOGO_CACHE["mtime"]:
+        names = {}
+        for file in os.listdir(LOGO_FOLDER_PATH):
+            names.setdefault(file.lower(), file)
+        _LOGO_CACHE["map"] = names
+        _LOGO_CACHE["mtime"] = mtime
+    return _LOGO_CACHE["map"]
+
+# (log path, default) -> resolved URL, dropped when the LOGO_FOLDER_PATH mtime changes.
+# The INI loader copies logos into that folder, so new logo files invalidate it too.
+_ASSET_URL_CACHE = {"mtime": None, "urls": {}}
+
 def get_asset_url(full_path_from_log, default_url):
     if not full_path_from_log or not str(full_path_from_log).strip():
         return default_url
+    try:
+        mtime = LOGO_FOLDER_PATH.stat().st_mtime
+    except OSError:
+        mtime = None
+    if mtime != _ASSET_URL_CACHE["mtime"]:
+        _ASSET_URL_CACHE["mtime"] = mtime
+        _ASSET_URL_CACHE["urls"] = {}
+    key = (full_path_from_log, default_url)
+    url = _ASSET_URL_CACHE["urls"].get(key)
+    if url is None:
+        url = _ASSET_URL_CACHE["urls"][key] = _resolve_asset_url(full_path_from_log, default_url)
+    return url
+
+def _resolve_asset_url(full_path_from_log, default_url):
     try:
         p = Path(str(full_path_from_log).strip())
-        if p.exists() and p.is_file():
+        if p.is_file():
             return f"{ADJACENT_LOGO_FOLDER_PATH}{p.name}"
     except Exception:
         pass
     try:
         name = Path(full_path_from_log).name
-        if LOGO_FOLDER_PATH.exists():
-            for file in os.listdir(LOGO_FOLDER_PATH):
-                if file.lower() == name.lower():
-                    return f"{ADJACENT_LOGO_FOLDER_PATH}{file}"
+        file = _logo_name_map().get(name.lower())
+        if file:
+            return f"{ADJACENT_LOGO_FOLDER_PATH}{file}"
     except Exception:
         pass
     return default_url
 
+# normcase'd .png file names in PLAYER_PHOTOS_FOLDER, rebuilt when the folder mtime changes
+_PLAYER_PHOTO_CACHE = {"mtime": None, "names": frozenset()}
+
+def _player_photo_names():
+    """Return the cached set of photo file names in PLAYER_PHOTOS_FOLDER."""
+    try:
+        mtime = PLAYER_PHOTOS_FOLDER.stat().st_mtime
+    except OSError:
+        return frozenset()
+    if mtime != _PLAYER_PHOTO_CACHE["mtime"]:
+        with os.scandir(PLAYER_PHOTOS_FOLDER) as entries:
+            names = frozenset(
+                os.path.normcase(entry.name) for entry in entries
+                if entry.name.lower().endswith(".png") and entry.is_file()
+            )
+        _PLAYER_PHOTO_CACHE["names"] = names
+        _PLAYER_PHOTO_CACHE["mtime"] = mtime
+    return _PLAYER_PHOTO_CACHE["names"]
+
 def get_player_photo_url(player_id, default_url=None):
     """
     Get player photo URL from assets/Players folder.
@@ -361,14 +671,12 @@ def get_player_photo_url(player_id, default_url=None):
         # Clean the player ID
         clean_id = str(player_id).strip()
         
-        # Check if player photo exists
-        player_photo_path = PLAYER_PHOTOS_FOLDER / f"{clean_id}.png"
-        
-        if player_photo_path.exists() and player_photo_path.is_file():
+        # Check if player photo exists (normcase matches the filesystem's case rules)
+        if os.path.normcase(f"{clean_id}.png") in _player_photo_names():
             # Return Flask-served relative URL
             return f"{ADJACENT_PLAYER_PHOTOS_PATH}{clean_id}.png"
         else:
-            logging.debug(f"Player photo not found for ID {clean_id}, using default")
+            logging.debug("Player photo not found for ID %s, using default", clean_id)
             return default_url
             
     except Exception as e:
@@ -397,6 +705,48 @@ def ensure_directories():
     except Exception as e:
         logging.warning(f"Could not create output directories: {e}")
 
+# ---------- JSON Helpers ----------
+_JSON_INDENT = 2 if PRETTY_JSON else None  # Compact unless PUBG_PRETTY_JSON is set
+
+def _json_default(obj):
+    """Encode the containers state keeps that JSON has no type for (id sets, the kill feed deque)."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=str)
+    if isinstance(obj, deque):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_bytes(data, indent=None):
+    """Serialize data to UTF-8 JSON bytes (compact when indent is None), using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent is not None:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_json_default, option=option)
+    return json.dumps(data, indent=indent, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+def _write_bytes(path, payload):
+    """Write payload to path via a temp file and os.replace.
+
+    Readers such as the web server never see a half-written file.
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        tmp.write_bytes(payload)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+def _read_json(path):
+    """Load JSON from path, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
 # ---------- Team Name Mapping Helpers ----------
 def _get_team_name_by_id(team_id):
     """Get team name for current match by team ID"""
@@ -408,26 +758,30 @@ def _get_team_name_by_id(team_id):
 def _get_team_id_by_name(team_name):
     """Get team ID for current match by team name"""
     current_match_id = state["current_match"]["id"]
-    if current_match_id and current_match_id in state["teamNameMapping"]:
-        mapping = state["teamNameMapping"][current_match_id]
-        for tid, tname in mapping.items():
-            if tname == team_name:
-                return tid
+    if current_match_id:
+        return state["teamNameMapping_reverse"].get(current_match_id, {}).get(team_name)
     return None
 
 def _register_team_mapping(team_id, team_name):
     """Register team ID -> name mapping for current match"""
     current_match_id = state["current_match"]["id"]
     if current_match_id:
-        if current_match_id not in state["teamNameMapping"]:
-            state["teamNameMapping"][current_match_id] = {}
-        state["teamNameMapping"][current_match_id][team_id] = team_name
+        mapping = state["teamNameMapping"].setdefault(current_match_id, {})
+        reverse = state["teamNameMapping_reverse"].setdefault(current_match_id, {})
+        old_name = mapping.get(team_id)
+        if old_name is not None and old_name != team_name and reverse.get(old_name) == team_id:
+            del reverse[old_name]
+        mapping[team_id] = team_name
+        reverse[team_name] = team_id
 
 def _cleanup_old_team_mappings():
     """Clean up team mappings for old matches"""
     current_match_id = state["current_match"]["id"]
     if current_match_id:
         state["teamNameMapping"] = {current_match_id: state["teamNameMapping"].get(current_match_id, {})}
+        state["teamNameMapping_reverse"] = {
+            current_match_id: state["teamNameMapping_reverse"].get(current_match_id, {})
+        }
 
 # ---------- State Management Functions ----------
 def _add_or_update_player(player_data, is_alive, health=0, health_max=100):
@@ -460,12 +814,14 @@ def _add_or_update_player(player_data, is_alive, health=0, health_max=100):
             }
         }
     else:
-        state["phase"]["players"][player_id]["live"]["isAlive"] = is_alive
-        state["phase"]["players"][player_id]["live"]["health"] = health
-        state["phase"]["players"][player_id]["live"]["healthMax"] = health_max
-        state["phase"]["players"][player_id]["teamName"] = team_name
+        phase_player = state["phase"]["players"][player_id]
+        phase_player["live"].update({
+            "isAlive": is_alive,
+            "health": health,
+            "healthMax": health_max
+        })
         # Update photo if we have a better one from assets
-        state["phase"]["players"][player_id]["photo"] = player_photo
+        phase_player.update({"teamName": team_name, "photo": player_photo})
 
 def _add_or_update_team(team_data):
     """Add or update a team's entry in the phase.teams state."""
@@ -484,12 +840,21 @@ def _add_or_update_team(team_data):
             },
         }
 
+# Live players _upsert_player_from_total could not copy into phase (team name not known yet).
+# Belongs to the current match: cleared whenever a new current_match dict is installed.
+_phase_pending_players = set()
+
 def _update_phase_from_live_match():
-    """Update phase state based on live match data."""
+    """Update phase state based on live match data.
+
+    Players are copied into phase by _upsert_player_from_total as they are parsed, so
+    only the ones it had to leave pending are handled here.
+    """
     match_id = state["current_match"]["id"]
     if not match_id:
         return
-    for team_id, team_data in state["current_match"]["teams"].items():
+    teams = state["current_match"]["teams"]
+    for team_id, team_data in teams.items():
         team_name = team_data.get("name", "Unknown Team")
         if team_name not in state["phase"]["teams"]:
             state["phase"]["teams"][team_name] = {
@@ -503,80 +868,97 @@ def _update_phase_from_live_match():
                     "wwcd": 0
                 }
             }
-        for player_id in team_data.get("players", []):
-            player_data = state["current_match"]["players"].get(player_id)
-            if player_data:
-                _add_or_update_player({
-                    "id": player_id,
-                    "name": player_data.get("name", "Unknown Player"),
-                    "photo": player_data.get("photo", DEFAULT_PLAYER_PHOTO),
-                    "teamName": team_name,
-                    "teamId": team_id
-                }, is_alive=player_data["live"]["isAlive"])
+    players = state["current_match"]["players"]
+    for player_id in list(_phase_pending_players):
+        player_data = players.get(player_id)
+        if player_data is None:
+            _phase_pending_players.discard(player_id)
+            continue
+        team_id = player_data["teamId"]
+        team_data = teams.get(team_id)
+        if team_data is None or player_id not in team_data.get("players", []):
+            continue
+        _add_or_update_player({
+            "id": player_id,
+            "name": player_data.get("name", "Unknown Player"),
+            "photo": player_data.get("photo", DEFAULT_PLAYER_PHOTO),
+            "teamName": team_data.get("name", "Unknown Team"),
+            "teamId": team_id
+        }, is_alive=player_data["live"]["isAlive"])
+        _phase_pending_players.discard(player_id)
+
+def _snapshot_starts(text):
+    """Return the offsets of every snapshot header in text."""
+    # str.find jumps straight to the literal part of the header; only those few
+    # candidates are checked against the full pattern
+    starts = []
+    find = text.find
+    match = SNAPSHOT_HEADER.match
+    i = find(SNAPSHOT_MARK, SNAPSHOT_STAMP_LEN)
+    while i >= 0:
+        if match(text, i - SNAPSHOT_STAMP_LEN):
+            starts.append(i - SNAPSHOT_STAMP_LEN)
+        i = find(SNAPSHOT_MARK, i + len(SNAPSHOT_MARK))
+    return starts
 
 def extract_snapshots(log_text):
     """Extract snapshots from log text without duplicate position tracking."""
-    snapshots = []
-    pos = 0
-    while True:
-        start_match = re.search(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] POST /totalmessage', log_text[pos:])
-        if not start_match:
-            break
-        start = pos + start_match.start()
-        next_start_match = re.search(r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] POST /totalmessage', log_text[start + len(start_match.group(0)):])
-        if next_start_match:
-            end = start + len(start_match.group(0)) + next_start_match.start()
-        else:
-            end = len(log_text)
-        snap_text = log_text[start:end]
-        snapshots.append(snap_text)
-        pos = end
-    return snapshots
+    # One pass over the headers; each snapshot runs up to the next header
+    starts = _snapshot_starts(log_text)
+    starts.append(len(log_text))
+    return [log_text[start:end] for start, end in zip(starts, starts[1:])]
 
 def parse_and_apply(log_text, parsed_logos=None, mode="chunk", progress_callback=None):
     """Parse log text and apply to state."""
-    global buffer
-    snapshots_processed = 0
-    if mode == "full":
-        snapshots = extract_snapshots(log_text)
-        total_snapshots = len(snapshots)
-        for idx, snap in enumerate(snapshots):
-            process_snapshot(snap, parsed_logos)
-            snapshots_processed += 1
-            if progress_callback and total_snapshots > 0:
-                processed_bytes = (idx + 1) / total_snapshots * len(log_text)
-                progress_callback(processed_bytes, len(log_text))
-    else:
+    global buffer, _tick_now
+    # One timestamp for every state update made while applying this chunk
+    _tick_now = int(time.time())
+    try:
+        snapshots_processed = 0
         buffer_start_len = len(buffer)
-        if log_text:
-            buffer += log_text
-        snapshots = extract_snapshots(buffer)
-        new_snapshots = len(snapshots)
-        for snap in snapshots:
-            process_snapshot(snap, parsed_logos)
-            snapshots_processed += 1
-        if snapshots:
-            last_end = 0
-            for snap in snapshots:
-                snap_start = buffer.find(snap)
-                if snap_start >= 0:
-                    last_end = max(last_end, snap_start + len(snap))
-            if last_end > 0:
-                buffer = buffer[last_end:]
-                logging.debug(f"Processed {new_snapshots} snapshots, buffer truncated to {len(buffer)} bytes")
-            else:
-                buffer = ''
-                logging.debug("No valid snapshots found; buffer cleared")
+        if mode == "full":
+            snapshots = extract_snapshots(log_text)
+            total_snapshots = len(snapshots)
+            for idx, snap in enumerate(snapshots):
+                # Counted before applying: a snapshot that raises may still have changed state
+                snapshots_processed += 1
+                process_snapshot(snap, parsed_logos)
+                if progress_callback and total_snapshots > 0:
+                    processed_bytes = (idx + 1) / total_snapshots * len(log_text)
+                    progress_callback(processed_bytes, len(log_text))
         else:
-            buffer = ''
-            logging.debug("No snapshots; buffer cleared")
-        if progress_callback and log_text:
-            progress_callback(len(log_text), len(log_text))
-    logging.debug(f"parse_and_apply: processed {snapshots_processed} snapshots (buffer was {buffer_start_len}, now {len(buffer)})")
+            if log_text:
+                buffer += log_text
+            starts = _snapshot_starts(buffer)
+            # The last snapshot may still be cut short, even when the chunk ends on a line
+            # boundary: hold it until the next header arrives. An empty log_text is a flush
+            # and processes whatever is buffered.
+            if log_text and starts:
+                keep_from = starts.pop()
+            else:
+                keep_from = len(buffer)
+            for start, end in zip(starts, starts[1:] + [keep_from]):
+                snapshots_processed += 1
+                process_snapshot(buffer[start:end], parsed_logos)
+            buffer = buffer[keep_from:]
+            logging.debug("Processed %s snapshots, %d bytes held for the next chunk", snapshots_processed, len(buffer))
+            if progress_callback and log_text:
+                progress_callback(len(log_text), len(log_text))
+        logging.debug(f"parse_and_apply: processed {snapshots_processed} snapshots (buffer was {buffer_start_len}, now {len(buffer)})")
+    finally:
+        _tick_now = None
+        # Snapshots change the live match and phase; all-time totals bump their own bucket
+        # when a match is finalized. A call that only buffered text changed nothing.
+        if snapshots_processed:
+            _bump_gen("match", "phase")
+
+def _now():
+    """Current epoch seconds, reusing the parse_and_apply timestamp when inside one."""
+    return _tick_now if _tick_now is not None else int(time.time())
 
 def process_snapshot(snap_text, parsed_logos):
     finalization_mode = "CATCHUP" if in_catchup_processing else "ARCHIVE" if in_archive_processing else "LIVE"
-    gid_match = re.search(r"GameID:\s*['\"]?(\d+)['\"]?", snap_text)
+    gid_match = GAME_ID.search(snap_text)
     new_game_id = gid_match.group(1) if gid_match else None
     if new_game_id and new_game_id in state["processed_matches"]:
         logging.info(f"{finalization_mode}: Skipping snapshot for already processed match {new_game_id}")
@@ -592,18 +974,21 @@ def process_snapshot(snap_text, parsed_logos):
         logging.info(f"{finalization_mode}: INITIALIZING MATCH: {new_game_id}")
         _reset_match_but_keep_id(new_game_id)
     _process_player_state_changes(snap_text)
-    parts = OBJ_BLOCKS.split(snap_text)
-    for i, marker in enumerate(parts):
-        if marker == "TotalPlayerList:" and i + 1 < len(parts):
-            for obj_txt in re.findall(r'\{[^{}]*\}', parts[i+1]):
-                p = _parse_kv_object(obj_txt)
-                _upsert_player_from_total(p)
-        elif marker == "TeamInfoList:" and i + 1 < len(parts):
-            for obj_txt in re.findall(r'\{[^{}]*\}', parts[i+1]):
-                t = _parse_kv_object(obj_txt)
-                _upsert_team_from_teaminfo(t, parsed_logos)
+    # Resolve this match's team-name mapping once for the whole snapshot
+    match_id = state["current_match"]["id"]
+    mapping = state["teamNameMapping"].setdefault(match_id, {}) if match_id else None
+    # Player ranks for the elimination check, gathered in the same pass
+    team_ranks = {}
+    for marker, obj_txt in _iter_list_objects(snap_text):
+        if marker == "TotalPlayerList:":
+            p = _parse_kv_object(obj_txt)
+            _upsert_player_from_total(p, mapping)
+            _add_player_rank(team_ranks, p)
+        else:
+            t = _parse_kv_object(obj_txt)
+            _upsert_team_from_teaminfo(t, parsed_logos, mapping)
     _recalculate_live_members()
-    _update_live_eliminations(snap_text)
+    _update_live_eliminations(team_ranks)
     if state["current_match"]["status"] == "finished" and not in_archive_processing and not in_catchup_processing:
         end_match_and_update_phase()
     if not in_archive_processing and not in_catchup_processing:
@@ -615,37 +1000,50 @@ def process_snapshot(snap_text, parsed_logos):
             logging.info("Match state went idle — resetting current_match to clean state.")
             _reset_current_match()
 
+def _fresh_match_dict(match_id=None):
+    """Empty current_match dict; live when given a match ID, idle otherwise."""
+    return {
+        "id": match_id,
+        "status": "live" if match_id else "idle",
+        "winnerTeamId": None,
+        "winnerTeamName": None,
+        "eliminationOrder": [],
+        "killFeed": deque(maxlen=KILL_FEED_SIZE),
+        "teams": {},
+        "players": {},
+        "_nameIndex": {},
+        "_aliveTeams": 0
+    }
+
 def _reset_match_but_keep_id(new_id=None):
     """Reset match state but keep the ID if provided."""
+    state["current_match"] = _fresh_match_dict(new_id)
+    _phase_pending_players.clear()
     if new_id:
-        state["current_match"] = {
-            "id": new_id,
-            "status": "live",
-            "winnerTeamId": None,
-            "winnerTeamName": None,
-            "eliminationOrder": [],
-            "killFeed": [],
-            "teams": {},
-            "players": {}
-        }
         logging.info(f"Reset match state with new ID: {new_id}")
     else:
-        state["current_match"] = {
-            "id": None,
-            "status": "idle",
-            "winnerTeamId": None,
-            "winnerTeamName": None,
-            "eliminationOrder": [],
-            "killFeed": [],
-            "teams": {},
-            "players": {}
-        }
         logging.info("Full clean reset of match state")
     state["match_state"]["status"] = "live" if new_id else "idle"
-    state["match_state"]["last_updated"] = int(time.time())
+    state["match_state"]["last_updated"] = _now()
+    _bump_gen("match")
+
+# Lower-cased team name -> INI entry, rebuilt when a different parsed_logos dict is passed in
+_INI_NAME_INDEX = {"source": None, "size": 0, "index": {}}
+
+def _ini_team_by_name(parsed_logos, team_name):
+    """Case-insensitive lookup of a team's INI entry by name."""
+    if parsed_logos is not _INI_NAME_INDEX["source"] or len(parsed_logos) != _INI_NAME_INDEX["size"]:
+        index = {}
+        for info in parsed_logos.values():
+            index.setdefault(info["name"].lower(), info)
+        _INI_NAME_INDEX.update(source=parsed_logos, size=len(parsed_logos), index=index)
+    return _INI_NAME_INDEX["index"].get(team_name.lower())
 
-def _upsert_team_from_teaminfo(t, parsed_logos):
-    """Update team in current_match, using log-provided name with case-insensitive logo matching."""
+def _upsert_team_from_teaminfo(t, parsed_logos, mapping=None):
+    """Update team in current_match, using log-provided name with case-insensitive logo matching.
+
+    mapping is the current match's teamNameMapping entry, if the caller already has it.
+    """
     tid = str(t.get("teamId") or "")
     if not tid or tid == "None":
         return
@@ -662,19 +1060,24 @@ def _upsert_team_from_teaminfo(t, parsed_logos):
     # Use log name
     team_name = t.get("teamName") or "Unknown Team"
     team["name"] = team_name
-    _register_team_mapping(tid, team_name)
+    # Names rarely change between snapshots; only register (forward and reverse) when they do
+    if mapping is None or mapping.get(tid) != team_name:
+        _register_team_mapping(tid, team_name)
     # Use INI logo if team name matches expected_teams (case-insensitive)
     if parsed_logos:
-        for info in parsed_logos.values():
-            if info["name"].lower() == team_name.lower():
-                team["logo"] = get_asset_url(info["logoPath"], DEFAULT_TEAM_LOGO)
-                logging.debug(f"Assigned INI logo {team['logo']} to team {team_name} (ID: {tid})")
-                break
+        info = _ini_team_by_name(parsed_logos, team_name)
+        if info:
+            team["logo"] = get_asset_url(info["logoPath"], DEFAULT_TEAM_LOGO)
+            logging.debug("Assigned INI logo %s to team %s (ID: %s)", team["logo"], team_name, tid)
         else:
             team["logo"] = DEFAULT_TEAM_LOGO
             logging.warning(f"No INI logo found for team {team_name} (ID: {tid}); using default logo {DEFAULT_TEAM_LOGO}")
 
-def _upsert_player_from_total(p):
+def _upsert_player_from_total(p, mapping=None):
+    """Update a player in current_match from a TotalPlayerList entry.
+
+    mapping is the current match's teamNameMapping entry, if the caller already has it.
+    """
     pid = str(p.get("uId") or "")
     tid = str(p.get("teamId") or "")
     if not pid or not tid or tid == "None":
@@ -691,6 +1094,10 @@ def _upsert_player_from_total(p):
     team.setdefault("placementPointsLive", 0)
     if pid not in team["players"]:
         team["players"].append(pid)
+        # Team kills are kept incrementally: a joining player brings the kills made so far
+        known = state["current_match"]["players"].get(pid)
+        if known:
+            team["kills"] += known["stats"]["kills"]
     is_alive = (p.get("liveState") != 5)
     
     # Get player photo from log OR from assets folder
@@ -704,41 +1111,49 @@ def _upsert_player_from_total(p):
         "stats": {"kills": 0, "damage": 0, "knockouts": 0},
         "rank": None  # Store rank from log
     })
-    player["name"] = p.get("playerName") or player["name"]
+    old_name = player["name"]
+    player["name"] = p.get("playerName") or old_name
+    name_index = state["current_match"].setdefault("_nameIndex", {})
+    if old_name != player["name"] and name_index.get(old_name) == pid:
+        del name_index[old_name]
+    name_index[player["name"]] = pid
     # Update photo: prefer assets folder, then log photo, then existing
     player["photo"] = get_player_photo_url(pid, log_photo or player["photo"])
     player["teamId"] = tid
-    player["live"] = {
+    # Update in place so readers holding the live dict never see it swapped out
+    player.setdefault("live", {}).update({
         "isAlive": is_alive,
         "health": int(p.get("health") or 0),
         "healthMax": int(p.get("healthMax") or 100),
         "liveState": int(p.get("liveState") or 0)
-    }
+    })
     player["rank"] = int(p.get("rank") or 0)  # Store the rank from the log
     new_kills = int(p.get("killNum") or 0)
     current_kills = player["stats"]["kills"]
     if new_kills > current_kills:
         kill_diff = new_kills - current_kills
         player["stats"]["kills"] = new_kills
+        team["kills"] += kill_diff
         if kill_diff > 0:
-            team_name = _get_team_name_by_id(tid) or "Unknown Team"
-            pn = player["name"]
-            for _ in range(kill_diff):
-                state["current_match"]["killFeed"].append(f"Kill: {pn} ({team_name}) got a new kill!")
-            state["current_match"]["killFeed"] = state["current_match"]["killFeed"][-5:]
+            team_name = (mapping.get(tid) if mapping is not None else _get_team_name_by_id(tid)) or "Unknown Team"
+            msg = f"Kill: {player['name']} ({team_name}) got a new kill!"
+            # The feed only keeps KILL_FEED_SIZE entries, so never push more than that
+            state["current_match"]["killFeed"].extend([msg] * min(kill_diff, KILL_FEED_SIZE))
     player["stats"]["damage"] = int(p.get("damage") or 0)
     player["stats"]["knockouts"] = int(p.get("knockouts") or 0)
-    team_name = _get_team_name_by_id(tid)
+    team_name = mapping.get(tid) if mapping is not None else _get_team_name_by_id(tid)
     if team_name:
         phase_player_data = {
             "id": pid,
             "name": player["name"],
+            "photo": player["photo"],
             "teamId": tid,
             "teamName": team_name
         }
         _add_or_update_player(phase_player_data, is_alive, 
                              player["live"]["health"], player["live"]["healthMax"])
-    _recompute_team_kills(tid)
+    else:
+        _phase_pending_players.add(pid)
 
 
 def _validate_and_correct_team_ranks(final_match_data):
@@ -751,37 +1166,28 @@ def _validate_and_correct_team_ranks(final_match_data):
     
     # Step 1: Extract team ranks from player data (use most common rank per team)
     team_ranks_from_players = {}
-    for pid, player in final_match_data.get("players", {}).items():
+    for player in final_match_data.get("players", {}).values():
         team_id = player.get("teamId")
         player_rank = player.get("rank", 0)
         
         if team_id and player_rank > 0:
-            if team_id not in team_ranks_from_players:
-                team_ranks_from_players[team_id] = []
-            team_ranks_from_players[team_id].append(player_rank)
+            team_ranks_from_players.setdefault(team_id, []).append(player_rank)
     
     # Get the most common rank for each team (should be consistent)
     team_log_ranks = {}
     for team_id, ranks in team_ranks_from_players.items():
         if ranks:
             # Use the most common rank (mode)
-            from collections import Counter
             most_common_rank = Counter(ranks).most_common(1)[0][0]
             team_log_ranks[team_id] = most_common_rank
             team_name = final_match_data["teams"][team_id].get("name", "Unknown")
-            logging.debug(f"Team {team_name} (ID: {team_id}) - Log rank: {most_common_rank} (from player ranks: {ranks})")
+            logging.debug("Team %s (ID: %s) - Log rank: %s (from player ranks: %s)", team_name, team_id, most_common_rank, ranks)
     
     # Step 2: Calculate ranks from elimination order (our current method)
     elimination_order = final_match_data.get("eliminationOrder", [])
     winner_name = final_match_data.get("winnerTeamName")
     
-    script_rank_map = {}
-    # Eliminated teams get ranks based on reverse elimination order
-    for i, team_name in enumerate(reversed(elimination_order)):
-        script_rank_map[team_name] = i + 2  # Start from rank 2
-    # Winner gets rank 1
-    if winner_name:
-        script_rank_map[winner_name] = 1
+    script_rank_map = _elimination_rank_map(elimination_order, winner_name)
     
     # Step 3: Compare script ranks vs log ranks
     discrepancies = []
@@ -828,11 +1234,7 @@ def _validate_and_correct_team_ranks(final_match_data):
                 final_match_data["winnerTeamId"] = log_winner_team_id
         
         # Rebuild elimination order based on log ranks (sorted by rank descending)
-        teams_by_log_rank = sorted(
-            [(team_name, rank) for team_name, rank in corrected_rank_map.items()],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        teams_by_log_rank = sorted(corrected_rank_map.items(), key=itemgetter(1), reverse=True)
         
         # Elimination order should exclude the winner (rank 1)
         new_elimination_order = [
@@ -852,67 +1254,64 @@ def _validate_and_correct_team_ranks(final_match_data):
         rank_map_to_use = script_rank_map
     
     # Step 5: Apply placement points based on validated/corrected ranks
-    placement_points_map = {1: 10, 2: 6, 3: 5, 4: 4, 5: 3, 6: 2, 7: 1, 8: 1}
-    
     for tid, team in final_match_data.get("teams", {}).items():
         team_name = team.get("name", "Unknown Team")
         rank = rank_map_to_use.get(team_name, len(final_match_data["teams"]))
-        placement_points = placement_points_map.get(rank, 0)
+        placement_pts = placement_points(rank)
         
         old_points = team.get("placementPointsLive", 0)
-        if old_points != placement_points:
+        if old_points != placement_pts:
             logging.info(
                 f"Correcting placement points for {team_name}: "
-                f"{old_points} -> {placement_points} (rank: {rank})"
+                f"{old_points} -> {placement_pts} (rank: {rank})"
             )
         
-        final_match_data["teams"][tid]["placementPointsLive"] = placement_points
-        logging.debug(f"Set {team_name} rank={rank}, placementPoints={placement_points}")
+        final_match_data["teams"][tid]["placementPointsLive"] = placement_pts
+        logging.debug("Set %s rank=%s, placementPoints=%s", team_name, rank, placement_pts)
     
     return final_match_data
 
 
+def _elimination_rank_map(elimination_order, winner_name):
+    """Map team name -> finishing rank from the elimination order (winner is rank 1)."""
+    # Eliminated teams get ranks based on reverse elimination order, starting from rank 2
+    rank_map = {team_name: i + 2 for i, team_name in enumerate(reversed(elimination_order))}
+    if winner_name:
+        rank_map[winner_name] = 1
+    return rank_map
+
 def _extract_final_snapshot_player_ranks(snap_text):
     """
     Extract player rank data from the final snapshot of a match.
     Returns dict of {team_id: [player_ranks]}
     """
     team_ranks = {}
-    parts = OBJ_BLOCKS.split(snap_text)
-    
-    for i, marker in enumerate(parts):
-        if marker == "TotalPlayerList:" and i + 1 < len(parts):
-            for obj_txt in re.findall(r'\{[^{}]*\}', parts[i+1]):
-                p = _parse_kv_object(obj_txt)
-                tid = str(p.get("teamId") or "")
-                rank = p.get("rank")
-                
-                # Validate rank
-                try:
-                    rank = int(rank) if rank is not None else 0
-                except (ValueError, TypeError):
-                    rank = 0
-                
-                if tid and tid != "None" and rank > 0:
-                    team_ranks.setdefault(tid, []).append(rank)
-    
+    for marker, obj_txt in _iter_list_objects(snap_text):
+        if marker == "TotalPlayerList:":
+            _add_player_rank(team_ranks, _parse_kv_object(obj_txt))
     return team_ranks
 
-def _recompute_team_kills(tid):
-    team = state["current_match"]["teams"].get(tid)
-    if not team:
-        return
-    total = 0
-    for pid in team["players"]:
-        total += state["current_match"]["players"].get(pid, {}).get("stats", {}).get("kills", 0)
-    team["kills"] = total
+def _add_player_rank(team_ranks, p):
+    """Append a parsed TotalPlayerList entry's rank to team_ranks[teamId] (unranked entries are skipped)."""
+    tid = str(p.get("teamId") or "")
+    rank = p.get("rank")
+    # Validate rank
+    try:
+        rank = int(rank) if rank is not None else 0
+    except (ValueError, TypeError):
+        rank = 0
+    if tid and tid != "None" and rank > 0:
+        # Store all player ranks for the team
+        team_ranks.setdefault(tid, []).append(rank)
 
 def _recalculate_live_members():
-    """Recalculate live members for each team."""
-    for team_id, team_data in state["current_match"]["teams"].items():
+    """Recalculate live members for each team and the number of teams still alive."""
+    players = state["current_match"]["players"]
+    alive_teams = 0
+    for team_data in state["current_match"]["teams"].values():
         live_count = 0
         for player_id in team_data.get("players", []):
-            player = state["current_match"]["players"].get(player_id)
+            player = players.get(player_id)
             if player:
                 is_alive = (
                     player["live"]["isAlive"] and 
@@ -923,68 +1322,68 @@ def _recalculate_live_members():
                     live_count += 1
         old_count = team_data.get("liveMembers", 0)
         team_data["liveMembers"] = live_count
+        if live_count > 0:
+            alive_teams += 1
         if old_count != live_count and old_count > 0:
             logging.info(f"Team {team_data['name']} live members: {old_count} -> {live_count}")
+    state["current_match"]["_aliveTeams"] = alive_teams
 
 def _process_player_state_changes(log_text):
     """Process player state changes, deaths, and knockouts."""
-    lines = log_text.splitlines()
-    for line in lines:
-        death_patterns = [
-            r'G_PlayerDied.*?PlayerName=([^,]+).*?Health=([^,]+)',
-            r'PlayerDied.*?Name=([^,]+).*?Health=([^,]+)',
-            r'Death.*?Player=([^,]+).*?Health=([^,]+)'
-        ]
-        for pattern in death_patterns:
-            m = re.search(pattern, line)
-            if m:
-                player_name = m.group(1).strip('\'"')
-                try:
-                    player_health = int(float(m.group(2)))
-                except (ValueError, TypeError):
-                    player_health = 0
-                _update_player_death_status(player_name, player_health)
-                break
+    # Most snapshots carry no death lines; a substring check is far cheaper than the regex scan
+    if "Died" not in log_text and "Death" not in log_text:
+        return
+    for m in DEATH_LINE.finditer(log_text):
+        player_name = m.group(1).strip('\'"')
+        try:
+            player_health = int(float(m.group(2)))
+        except (ValueError, TypeError):
+            player_health = 0
+        _update_player_death_status(player_name, player_health)
 
 def _update_player_death_status(player_name, health):
     """Update a specific player's death status by name."""
-    for p_id, p_data in state["current_match"]["players"].items():
-        if p_data["name"] == player_name:
-            p_data["live"]["isAlive"] = False
-            p_data["live"]["health"] = health
-            p_data["live"]["liveState"] = 5
-            logging.info(f"Player {player_name} died (health: {health})")
-            return
-    for p_id, p_data in state["phase"]["players"].items():
-        if p_data["name"] == player_name:
-            _add_or_update_player(p_data, is_alive=False, health=health)
-            return
-
-def _update_live_eliminations(snap_text):
-    """Update live eliminations tracking by team ranks from player data."""
-    # Step 1: Collect team ranks from players in the snapshot
-    team_ranks = {}
-    parts = OBJ_BLOCKS.split(snap_text)
-    for i, marker in enumerate(parts):
-        if marker == "TotalPlayerList:" and i + 1 < len(parts):
-            for obj_txt in re.findall(r'\{[^{}]*\}', parts[i+1]):
-                p = _parse_kv_object(obj_txt)
-                tid = str(p.get("teamId") or "")
-                rank = p.get("rank")
-                # Validate rank
-                try:
-                    rank = int(rank) if rank is not None else 0
-                except (ValueError, TypeError):
-                    rank = 0
-                if tid and tid != "None" and rank > 0:
-                    # Store all player ranks for the team
-                    team_ranks.setdefault(tid, []).append(rank)
-
+    p_id = state["current_match"].get("_nameIndex", {}).get(player_name)
+    p_data = state["current_match"]["players"].get(p_id) if p_id else None
+    if p_data:
+        p_data["live"]["isAlive"] = False
+        p_data["live"]["health"] = health
+        p_data["live"]["liveState"] = 5
+        logging.info(f"Player {player_name} died (health: {health})")
+        return
+    p_data = _phase_player_by_name(player_name)
+    if p_data:
+        _add_or_update_player(p_data, is_alive=False, health=health)
+
+# (phase players dict, its size, name -> player id). Phase players are only ever added
+# and keep their name, so the index holds while the same dict has the same size.
+_phase_name_index = (None, 0, {})
+
+def _phase_player_by_name(player_name):
+    """Find a phase player by name without scanning every phase player."""
+    global _phase_name_index
+    players = state["phase"]["players"]
+    indexed, size, index = _phase_name_index
+    if indexed is not players or size != len(players):
+        index = {}
+        for pid, p_data in players.items():
+            index.setdefault(p_data["name"], pid)  # First match wins, as with a scan
+        _phase_name_index = (players, len(players), index)
+    pid = index.get(player_name)
+    return players.get(pid) if pid is not None else None
+
+def _update_live_eliminations(team_ranks):
+    """Update live eliminations tracking by team ranks from player data.
+
+    team_ranks maps team ID -> ranks of that team's players in the snapshot, as
+    collected by process_snapshot while it parses the TotalPlayerList.
+    """
     # Step 2: Identify newly eliminated teams (liveMembers == 0)
     eliminated_teams = []
+    already_eliminated = set(state["current_match"]["eliminationOrder"])
     for tid, team in state["current_match"]["teams"].items():
         team_name = team["name"]
-        if team["liveMembers"] == 0 and team_name not in state["current_match"]["eliminationOrder"]:
+        if team["liveMembers"] == 0 and team_name not in already_eliminated:
             # Use the maximum rank from the team's players (higher rank = earlier elimination)
             ranks = team_ranks.get(tid, [float('inf')])
             rank = max(ranks) if ranks else float('inf')
@@ -992,20 +1391,21 @@ def _update_live_eliminations(snap_text):
             logging.info(f"Team {team_name} (ID: {tid}) eliminated with rank {rank} (player ranks: {ranks})")
 
     # Step 3: Sort eliminated teams by rank descending (higher rank = earlier elimination)
-    eliminated_teams.sort(key=lambda x: x[2], reverse=True)
+    eliminated_teams.sort(key=itemgetter(2), reverse=True)
 
     # Step 4: Append to eliminationOrder in sorted order
     for tid, team_name, rank in eliminated_teams:
         state["current_match"]["eliminationOrder"].append(team_name)
-        logging.debug(f"Added {team_name} to eliminationOrder with rank {rank}")
+        logging.debug("Added %s to eliminationOrder with rank %s", team_name, rank)
 
-    # Step 5: Check for match end (only one team left alive)
-    alive = [tid for tid, t in state["current_match"]["teams"].items() if t["liveMembers"] > 0]
-    if len(alive) == 1 and state["current_match"]["status"] == "live":
-        state["current_match"]["winnerTeamId"] = alive[0]
-        state["current_match"]["winnerTeamName"] = _get_team_name_by_id(alive[0])
-        state["current_match"]["status"] = "finished"
-        logging.info(f"Match ended. Winner: {state['current_match']['winnerTeamName']} (ID: {alive[0]})")
+    # Step 5: Check for match end (only one team left alive; counted by _recalculate_live_members)
+    match = state["current_match"]
+    if match["_aliveTeams"] == 1 and match["status"] == "live":
+        winner_id = next(tid for tid, t in match["teams"].items() if t["liveMembers"] > 0)
+        match["winnerTeamId"] = winner_id
+        match["winnerTeamName"] = _get_team_name_by_id(winner_id)
+        match["status"] = "finished"
+        logging.info(f"Match ended. Winner: {match['winnerTeamName']} (ID: {winner_id})")
 
 def end_match_and_update_phase(final_match_data=None):
     """
@@ -1015,13 +1415,13 @@ def end_match_and_update_phase(final_match_data=None):
     global state, expected_teams, in_archive_processing
     try:
         if not final_match_data:
-            final_match_data = copy.deepcopy(state["current_match"])
+            final_match_data = _finished_match_data(state["current_match"])
 
         match_id = final_match_data.get("id")
         if not match_id:
             logging.warning("No match ID found, skipping finalization")
             _reset_current_match()
-            _export_json()
+            _request_export()
             return
 
         logging.info(f"Finalizing match {match_id}")
@@ -1035,22 +1435,7 @@ def end_match_and_update_phase(final_match_data=None):
 
         # Add missing teams (only if not processing archive)
         if not in_archive_processing and expected_teams:
-            match_team_names = {t.get("name", "").lower() for t in final_match_data.get("teams", {}).values()}
-            missing = []
-            for team_name, info in expected_teams.items():
-                if team_name.lower() not in match_team_names:
-                    missing.append({
-                        "id": info["id"],
-                        "name": team_name,
-                        "logo": get_asset_url(info["logoPath"], DEFAULT_TEAM_LOGO),
-                        "kills": 0,
-                        "placementPoints": 0,
-                        "points": 0,
-                        "rank": "MISS",
-                        "liveMembers": 0,
-                        "players": [],
-                        "missing": True
-                    })
+            missing = _missing_teams(final_match_data.get("teams", {}))
             final_match_data["missing_teams"] = missing
             logging.debug(f"Match {match_id}: Added {len(missing)} missing teams")
 
@@ -1060,23 +1445,22 @@ def end_match_and_update_phase(final_match_data=None):
         # --- Calculate and assign placementPointsLive per team ---
         # NOTE: This section is now handled by _validate_and_correct_team_ranks
         # but keeping this as fallback for teams without player data
-        elimination_order = final_match_data.get("eliminationOrder", [])
         total_teams = len(final_match_data.get("teams", {}))
-        rank_map = {t: i + 2 for i, t in enumerate(reversed(elimination_order))}
-        winner_name = final_match_data.get("winnerTeamName")
-        if winner_name:
-            rank_map[winner_name] = 1
-
-        placement_points_map = {1: 10, 2: 6, 3: 5, 4: 4, 5: 3, 6: 2, 7: 1, 8: 1}
+        rank_map = None  # Built on first use; validation normally covers every team
 
         # Only apply fallback placement points if not already set by validation
         for tid, team in final_match_data.get("teams", {}).items():
             if "placementPointsLive" not in team or team["placementPointsLive"] is None:
+                if rank_map is None:
+                    rank_map = _elimination_rank_map(
+                        final_match_data.get("eliminationOrder", []),
+                        final_match_data.get("winnerTeamName")
+                    )
                 team_name = team.get("name", "Unknown Team")
                 rank = rank_map.get(team_name, total_teams)
-                placement_points = placement_points_map.get(rank, 0)
-                final_match_data["teams"][tid]["placementPointsLive"] = placement_points
-                logging.debug(f"Fallback: Set {team_name} placementPointsLive={placement_points} (rank={rank})")
+                placement_pts = placement_points(rank)
+                final_match_data["teams"][tid]["placementPointsLive"] = placement_pts
+                logging.debug(f"Fallback: Set {team_name} placementPointsLive={placement_pts} (rank={rank})")
 
         # --- Update all-time players only if this match was not already processed ---
         if not already_processed:
@@ -1099,16 +1483,20 @@ def end_match_and_update_phase(final_match_data=None):
                 ap["name"] = player.get("name", ap.get("name"))
                 ap["photo"] = get_player_photo_url(pid, player.get("photo", ap.get("photo")))
                 ap["teamName"] = team_name
-                ap["totals"]["kills"] += int(player.get("stats", {}).get("kills", 0))
-                ap["totals"]["damage"] += int(player.get("stats", {}).get("damage", 0))
-                ap["totals"]["knockouts"] += int(player.get("stats", {}).get("knockouts", 0))
-                ap["totals"]["matches"] += 1
+                totals = ap["totals"]
+                stats = player.get("stats", {})
+                totals["kills"] += int(stats.get("kills", 0))
+                totals["damage"] += int(stats.get("damage", 0))
+                totals["knockouts"] += int(stats.get("knockouts", 0))
+                totals["matches"] += 1
                 player_count += 1
 
             # record processed game id and persist all-time players
             state["all_time"]["processed_game_ids"].add(match_id)
+            _bump_gen("all_time")
             try:
-                save_all_time_players()
+                # Serialized now, written off the live loop's state_lock
+                save_all_time_players(background=True)
                 logging.info(f"Saved all-time players after match {match_id} (updated {player_count} players)")
             except Exception as e:
                 logging.error(f"Failed saving all-time players for {match_id}: {e}")
@@ -1116,30 +1504,30 @@ def end_match_and_update_phase(final_match_data=None):
             logging.info(f"Match {match_id} already in all_time processed list; skipping all-time update")
 
         # --- Append to state['matches'] only if not already present ---
-        if not any(m.get("id") == match_id for m in state.get("matches", [])):
+        # processed_matches holds the id of every appended match, so it stands in for a list scan
+        processed_matches = state.setdefault("processed_matches", set())
+        if match_id not in processed_matches:
+            processed_matches.add(match_id)
             state.setdefault("matches", []).append(final_match_data)
             logging.info(f"Appended match {match_id} to state['matches'] (now {len(state['matches'])} matches)")
         else:
             logging.debug(f"Match {match_id} already exists in state['matches'] — not appending")
 
-        # mark processed_matches for in-memory check
-        state.setdefault("processed_matches", set()).add(match_id)
-
         # --- Rebuild phase from canonical matches list so we never double-count ---
         rebuild_phase_from_matches()
 
         # Reset current match state (keeps matches list intact)
         _reset_current_match()
         state["match_state"]["status"] = "idle"
-        state["match_state"]["last_updated"] = int(time.time())
+        state["match_state"]["last_updated"] = _now()
         logging.info(f"Match {match_id} finalized and current match reset")
         
-        _export_json()
+        _request_export()
 
     except Exception as e:
         logging.error(f"Error finalizing match {match_id}: {e}")
         _reset_current_match()
-        _export_json()
+        _request_export()
 
 def rebuild_phase_from_matches():
     """
@@ -1150,35 +1538,32 @@ def rebuild_phase_from_matches():
     """
     global state
     logging.info("Rebuilding phase data from state['matches']")
-    # Deduplicate matches by id, preserving first occurrence
-    seen = set()
-    unique_matches = []
-    for m in state.get("matches", []):
-        mid = m.get("id")
-        if not mid:
-            continue
-        if mid in seen:
-            logging.debug(f"Skipping duplicate match id in rebuild: {mid}")
-            continue
-        seen.add(mid)
-        unique_matches.append(m)
-    state["matches"] = unique_matches
+    # Matches are appended only with a new id recorded in processed_matches, so equal
+    # sizes mean the list is already unique; otherwise deduplicate by id, keeping the first
+    matches = state.setdefault("matches", [])
+    if len(matches) != len(state.get("processed_matches", ())):
+        seen = set()
+        unique_matches = []
+        for m in matches:
+            mid = m.get("id")
+            if not mid:
+                continue
+            if mid in seen:
+                logging.debug(f"Skipping duplicate match id in rebuild: {mid}")
+                continue
+            seen.add(mid)
+            unique_matches.append(m)
+        state["matches"] = unique_matches
 
     # Reset phase
-    state["phase"]["teams"] = {}
-    state["phase"]["players"] = {}
-
-    # Helper for placement points fallback
-    placement_points_map = {1: 10, 2: 6, 3: 5, 4: 4, 5: 3, 6: 2, 7: 1, 8: 1}
+    phase_teams = state["phase"]["teams"] = {}
+    phase_players = state["phase"]["players"] = {}
 
     for match in state["matches"]:
         # compute elimination/ranks fallback only if needed
-        elimination_order = match.get("eliminationOrder", [])
         total_teams = len(match.get("teams", {})) or 0
-        rank_map = {t: i + 2 for i, t in enumerate(reversed(elimination_order))}
         winner_name = match.get("winnerTeamName")
-        if winner_name:
-            rank_map[winner_name] = 1
+        rank_map = None
 
         # Per-team accumulation for this match
         for tid, team in match.get("teams", {}).items():
@@ -1186,22 +1571,24 @@ def rebuild_phase_from_matches():
             kills = int(team.get("kills", 0))
             # prefer placementPointsLive if present (set at finalization), otherwise compute via rank_map / fallback map
             if "placementPointsLive" in team:
-                placement_points = int(team.get("placementPointsLive", 0))
+                placement_pts = int(team.get("placementPointsLive", 0))
             else:
+                if rank_map is None:
+                    rank_map = _elimination_rank_map(match.get("eliminationOrder", []), winner_name)
                 rank = rank_map.get(team_name, total_teams or 0)
-                placement_points = placement_points_map.get(rank, 0)
-            points = kills + placement_points
-            if team_name not in state["phase"]["teams"]:
-                state["phase"]["teams"][team_name] = {
+                placement_pts = placement_points(rank)
+            phase_team = phase_teams.get(team_name)
+            if phase_team is None:
+                phase_team = phase_teams[team_name] = {
                     "id": team.get("id", tid),
                     "name": team_name,
                     "logo": team.get("logo", DEFAULT_TEAM_LOGO),
                     "totals": {"kills": 0, "placementPoints": 0, "points": 0, "wwcd": 0}
                 }
-            tt = state["phase"]["teams"][team_name]["totals"]
+            tt = phase_team["totals"]
             tt["kills"] += kills
-            tt["placementPoints"] += placement_points
-            tt["points"] += points
+            tt["placementPoints"] += placement_pts
+            tt["points"] += kills + placement_pts
             if team_name == winner_name:
                 tt["wwcd"] += 1
 
@@ -1209,8 +1596,9 @@ def rebuild_phase_from_matches():
         for pid, p in match.get("players", {}).items():
             # determine team name (prefer mapping helper)
             team_name = _get_team_name_by_id(p.get("teamId")) or p.get("teamName") or "Unknown Team"
-            if pid not in state["phase"]["players"]:
-                state["phase"]["players"][pid] = {
+            phase_player = phase_players.get(pid)
+            if phase_player is None:
+                phase_player = phase_players[pid] = {
                     "id": pid,
                     "name": p.get("name", "Unknown Player"),
                     "photo": p.get("photo", DEFAULT_PLAYER_PHOTO),
@@ -1218,13 +1606,15 @@ def rebuild_phase_from_matches():
                     "live": {"isAlive": False, "health": 0, "healthMax": 100},
                     "totals": {"kills": 0, "damage": 0, "knockouts": 0, "matches": 0}
                 }
-            pp = state["phase"]["players"][pid]["totals"]
-            pp["kills"] += int(p.get("stats", {}).get("kills", 0))
-            pp["damage"] += int(p.get("stats", {}).get("damage", 0))
-            pp["knockouts"] += int(p.get("stats", {}).get("knockouts", 0))
+            pp = phase_player["totals"]
+            stats = p.get("stats", {})
+            pp["kills"] += int(stats.get("kills", 0))
+            pp["damage"] += int(stats.get("damage", 0))
+            pp["knockouts"] += int(stats.get("knockouts", 0))
             pp["matches"] += 1
 
     # Recompute derived lists
+    _bump_gen("phase")
     try:
         state["phase"]["standings"] = _phase_standings()
     except Exception:
@@ -1241,7 +1631,7 @@ def rebuild_phase_from_matches():
                 "wwcd": tot.get("wwcd", 0),
                 "rank": None
             })
-        teams.sort(key=lambda x: (x["points"], x["kills"]), reverse=True)
+        teams.sort(key=_STANDINGS_KEY, reverse=True)
         for i, row in enumerate(teams, 1):
             row["rank"] = i
         state["phase"]["standings"] = teams
@@ -1257,79 +1647,109 @@ def _reset_current_match():
     """Reset the current_match state to its comprehensive initial idle state."""
     global state
     state["current_match"] = {
-        "id": None,
-        "status": "idle",
-        "winnerTeamId": None,
-        "winnerTeamName": None,
-        "eliminationOrder": [],
-        "killFeed": [],
-        "teams": {},
-        "players": {},
+        **_fresh_match_dict(),
         "missing_teams": [],
         "leaderboards": {"currentMatchTopPlayers": []},
         "activePlayers": 0,
         "teamKills": 0,
         "placementPointsMap": {}
     }
+    _phase_pending_players.clear()
     state["match_state"]["status"] = "idle"
-    state["match_state"]["last_updated"] = int(time.time())
+    state["match_state"]["last_updated"] = _now()
+    _bump_gen("match")
     logging.info("Current match state comprehensively reset to idle.")
 
 def _print_terminal_snapshot(test_mode=False):
     """Enhanced terminal output with colors and simulation progress."""
+    global _frame_lines
+    # Only building the frame needs the state; the console write happens unlocked
+    with state_lock:
+        frame = _render_terminal_snapshot(test_mode)
+    lines = frame.split("\n")
+    for name in ("stdout", "stderr"):
+        if not isinstance(getattr(sys, name), _TrackedStream):
+            setattr(sys, name, _TrackedStream(getattr(sys, name)))
+    with _frame_lock:
+        prev = _frame_lines
+        writes_seen = _terminal_writes
+    if os.name == 'nt' and not COLORAMA_AVAILABLE:
+        # Plain Windows consoles don't translate ANSI escapes
+        os.system('cls')
+        out = frame
+    elif prev is None or len(prev) != len(lines):
+        out = _CLEAR_SCREEN + frame
+    else:
+        # Same layout as the frame on screen: rewrite only the rows that differ, then park the cursor below
+        out = "".join(
+            f"\x1b[{row};1H\x1b[2K{line}"
+            for row, (old, line) in enumerate(zip(prev, lines), 1) if line != old
+        ) + f"\x1b[{len(lines)};1H"
+    # Frames bypass the proxy so they don't mark themselves dirty
+    sys.stdout.stream.write(out)
+    sys.stdout.stream.flush()
+    with _frame_lock:
+        _frame_lines = lines if _terminal_writes == writes_seen else None
+
+def _render_terminal_snapshot(test_mode=False):
+    """Build the terminal frame for _print_terminal_snapshot as a string."""
     m = state["current_match"]
-    os.system('cls' if os.name == 'nt' else 'clear')
-    mode_text = "TEST MODE" if test_mode else "LIVE MODE"
-    mode_color = Fore.YELLOW if test_mode else Fore.GREEN
-    print_colored("╔" + "═" * 58 + "╗", Fore.BLUE)
-    print_colored(f"║{' ' * 20}PUBG LIVE SCOREBOARD{' ' * 19}║", Fore.CYAN, Style.BRIGHT)
-    print_colored(f"║{' ' * 15}{mode_text} - {datetime.datetime.now().strftime('%H:%M:%S')}{' ' * (42 - len(mode_text))}║", mode_color)
-    print_colored("╠" + "═" * 58 + "╣", Fore.BLUE)
+    # Build the whole frame first and write it out in one go
+    buf = io.StringIO()
+    mode_text, mode_color, mode_pad = _MODE_DISPLAY[bool(test_mode)]
+    buf.write(_TOP_BORDER)
+    buf.write(_TITLE_ROW)
+    print_colored(f"║{' ' * 15}{mode_text} - {datetime.datetime.now().strftime('%H:%M:%S')}{mode_pad}║", mode_color, buf=buf)
+    buf.write(_MID_BORDER)
     match_id = m['id'] or 'waiting...'
     status = m['status']
     status_color = Fore.GREEN if status == "live" else Fore.YELLOW if status == "finished" else Fore.WHITE
-    print_colored(f"║ Match: {match_id:<20} Status: ", Fore.WHITE, end="")
-    print_colored(f"{status:<15} ║", status_color)
+    print_colored(f"║ Match: {match_id:<20} Status: ", Fore.WHITE, end="", buf=buf)
+    print_colored(f"{status:<15} ║", status_color, buf=buf)
     if test_mode and simulation_manager:
         progress_str = simulation_manager.get_progress_string()
-        print_colored(f"║ Simulation: {progress_str:<38} ║", Fore.CYAN)
-    print_colored("╠" + "═" * 58 + "╣", Fore.BLUE)
-    print_colored("║ TEAMS" + " " * 53 + "║", Fore.CYAN, Style.BRIGHT)
-    print_colored("║ Team Name              Kills  Live  Points         ║", Fore.WHITE, Style.DIM)
-    print_colored("║" + "─" * 58 + "║", Fore.BLUE)
+        print_colored(f"║ Simulation: {progress_str:<38} ║", Fore.CYAN, buf=buf)
+    buf.write(_MID_BORDER)
+    buf.write(_TEAMS_ROW)
+    buf.write(_TEAMS_HEADER_ROW)
+    buf.write(_ROW_RULE)
     rows = []
-    for tid, t in m["teams"].items():
+    for t in m["teams"].values():
         live_points = t.get("placementPointsLive", 0)
         total_points = t["kills"] + live_points
         rows.append((t["name"], t["kills"], t["liveMembers"], total_points))
-    rows.sort(key=lambda r: (r[3], r[1]), reverse=True)
+    rows.sort(key=itemgetter(3, 1), reverse=True)
     for i, (name, kills, live, points) in enumerate(rows[:8]):
-        rank_color = Fore.YELLOW if i == 0 else Fore.GREEN if i < 3 else Fore.WHITE
+        rank_color = _RANK_COLORS[i]
         alive_color = Fore.GREEN if live > 0 else Fore.RED
         name_display = name[:22] if len(name) <= 22 else name[:19] + "..."
-        print_colored(f"║ {name_display:<22} ", Fore.WHITE, end="")
-        print_colored(f"{kills:>3}   ", rank_color, end="")
-        print_colored(f"{live:>2}   ", alive_color, end="")
-        print_colored(f"{points:>3}          ║", rank_color)
-    for _ in range(max(0, 8 - len(rows))):
-        print_colored("║" + " " * 58 + "║", Fore.WHITE)
-    print_colored("╠" + "═" * 58 + "╣", Fore.BLUE)
-    print_colored("║ RECENT KILLS" + " " * 46 + "║", Fore.RED, Style.BRIGHT)
-    kill_feed = m["killFeed"][-4:]
+        print_colored(f"║ {name_display:<22} ", Fore.WHITE, end="", buf=buf)
+        print_colored(f"{kills:>3}   ", rank_color, end="", buf=buf)
+        print_colored(f"{live:>2}   ", alive_color, end="", buf=buf)
+        print_colored(f"{points:>3}          ║", rank_color, buf=buf)
+    buf.write(_BLANK_ROW * max(0, 8 - len(rows)))
+    buf.write(_MID_BORDER)
+    buf.write(_KILLS_ROW)
+    kill_feed = list(m["killFeed"])[-4:]
     for kill in kill_feed:
         kill_display = kill[:56] if len(kill) <= 56 else kill[:53] + "..."
-        print_colored(f"║ {kill_display:<56} ║", Fore.YELLOW)
-    for _ in range(max(0, 4 - len(kill_feed))):
-        print_colored("║" + " " * 58 + "║", Fore.WHITE)
-    print_colored("╚" + "═" * 58 + "╝", Fore.BLUE)
+        print_colored(f"║ {kill_display:<56} ║", Fore.YELLOW, buf=buf)
+    buf.write(_BLANK_ROW * max(0, 4 - len(kill_feed)))
+    buf.write(_BOTTOM_BORDER)
     phase_teams = _phase_standings()[:3]
     if phase_teams:
-        print_colored("\nPHASE STANDINGS (Top 3):", Fore.MAGENTA, Style.BRIGHT)
+        print_colored("\nPHASE STANDINGS (Top 3):", Fore.MAGENTA, Style.BRIGHT, buf=buf)
         for i, team in enumerate(phase_teams, 1):
             medal = "1st" if i == 1 else "2nd" if i == 2 else "3rd"
             print_colored(f"{medal} {team['teamName']}: {team['points']} pts ({team['kills']} K + {team['placementPoints']} P)", 
-                         Fore.YELLOW if i == 1 else Fore.WHITE)
+                         Fore.YELLOW if i == 1 else Fore.WHITE, buf=buf)
+    return buf.getvalue()
+
+# Standings order: points, then kills (itemgetter keeps the key extraction in C)
+_STANDINGS_KEY = itemgetter("points", "kills")
+_FIRST_ITEM = itemgetter(0)
 
+@_cached_for_gen("phase")
 def _phase_standings():
     """Generate phase standings from cumulative phase data"""
     teams = []
@@ -1344,31 +1764,43 @@ def _phase_standings():
             "wwcd": tot.get("wwcd", 0),
             "rank": None
         })
-    teams.sort(key=lambda x: (x["points"], x["kills"]), reverse=True)
+    teams.sort(key=_STANDINGS_KEY, reverse=True)
     for i, row in enumerate(teams, 1):
         row["rank"] = i
     return teams
 
+@_cached_for_gen("match")
 def _current_match_top_players():
+    # Pick the top 5 first so output rows are only built for them
+    keyed = ((_top_player_key(p), pid, p) for pid, p in state["current_match"]["players"].items())
+    top = [(pid, p) for _, pid, p in heapq.nlargest(5, keyed, key=_FIRST_ITEM)]
+    # Resolve the match's team-name mapping once rather than per player
+    match_id = state["current_match"]["id"]
+    mapping = state["teamNameMapping"].get(match_id, {}) if match_id else {}
     players = []
-    for pid, p in state["current_match"]["players"].items():
-        team_name = _get_team_name_by_id(p["teamId"]) or "Unknown Team"
+    for pid, p in top:
+        team_name = mapping.get(p["teamId"]) or "Unknown Team"
         players.append({
             "playerId": pid, "teamName": team_name, "name": p["name"],
             "kills": p["stats"]["kills"], "damage": p["stats"]["damage"], 
             "knockouts": p["stats"]["knockouts"]
         })
-    players.sort(key=lambda x: (x["kills"], x["damage"], x["knockouts"]), reverse=True)
-    return players[:5]
+    return players
 
+def _all_time_totals_key(item):
+    """Sort key for (player id, all-time entry): total kills, damage, knockouts."""
+    t = item[1].get("totals", {})
+    return (t.get("kills", 0), t.get("damage", 0), t.get("knockouts", 0))
+
+@_cached_for_gen("all_time")
 def _all_time_top_players():
+    valid = (
+        (pid, p) for pid, p in state["all_time"]["players"].items()
+        if isinstance(p, dict) and isinstance(p.get("totals", {}), dict)
+    )
     players = []
-    for pid, p in state["all_time"]["players"].items():
-        if not isinstance(p, dict):
-            continue
+    for pid, p in heapq.nlargest(5, valid, key=_all_time_totals_key):
         t = p.get("totals", {})
-        if not isinstance(t, dict):
-            continue
         players.append({
             "playerId": pid,
             "name": p.get("name", "Unknown"),
@@ -1379,41 +1811,49 @@ def _all_time_top_players():
             "totalKnockouts": t.get("knockouts", 0),
             "totalMatches": t.get("matches", 0)
         })
-    players.sort(key=lambda x: (x["totalKills"], x["totalDamage"], x["totalKnockouts"]), reverse=True)
-    return players[:5]
+    return players
+
+_ACTIVE_PLAYER_KEY = itemgetter(0, 1, 2)
 
+@_cached_for_gen("match")
 def _get_active_players():
     """Returns active players with health data."""
     if state["current_match"]["status"] != "live":
         return []
-    active_players = []
+    # team id -> (name, logo), resolved once per call instead of once per player
+    team_info = {
+        tid: (t.get("name", "Unknown Team"), t.get("logo", DEFAULT_TEAM_LOGO))
+        for tid, t in state["current_match"]["teams"].items()
+    }
+    unknown_team = ("Unknown Team", DEFAULT_TEAM_LOGO)
+    # (team name, is dead, -kills, record): the sort key sits next to each record
+    keyed = []
     for player_id, player_data in state["current_match"]["players"].items():
-        team_data = state["current_match"]["teams"].get(player_data["teamId"], {})
-        team_name = team_data.get("name", "Unknown Team")
-        active_players.append({
+        team_name, team_logo = team_info.get(player_data["teamId"], unknown_team)
+        live = player_data["live"]
+        stats = player_data["stats"]
+        keyed.append((team_name, not live["isAlive"], -stats["kills"], {
             "playerId": player_id,
             "name": player_data["name"],
             "teamId": player_data["teamId"],
             "teamName": team_name,
-            "teamLogo": team_data.get("logo", DEFAULT_TEAM_LOGO),
+            "teamLogo": team_logo,
             "live": {
-                "isAlive": player_data["live"]["isAlive"],
-                "health": player_data["live"]["health"],
-                "healthMax": player_data["live"]["healthMax"],
-                "liveState": player_data["live"]["liveState"]
+                "isAlive": live["isAlive"],
+                "health": live["health"],
+                "healthMax": live["healthMax"],
+                "liveState": live["liveState"]
             },
             "stats": {
-                "kills": player_data["stats"]["kills"],
-                "damage": player_data["stats"]["damage"],
-                "knockouts": player_data["stats"]["knockouts"]
+                "kills": stats["kills"],
+                "damage": stats["damage"],
+                "knockouts": stats["knockouts"]
             }
-        })
-    return sorted(active_players, key=lambda p: (
-        p["teamName"],
-        not p["live"]["isAlive"],
-        -p["stats"]["kills"]
-    ))
+        }))
+    keyed.sort(key=_ACTIVE_PLAYER_KEY)
+    return [entry[3] for entry in keyed]
 
+@_cached_for_gen("match")
 def _get_team_kills():
     """Returns current match team kills."""
     if state["current_match"]["status"] != "live":
@@ -1428,8 +1868,60 @@ def _get_team_kills():
         }
     return team_kills
 
+# State generations (plus expected_teams identity) of the last export
+_last_export_key = None
+# Exports are numbered when serialized so a slow writer never overwrites a newer file
+_export_seq = 0
+_written_export_seq = 0
+# Bytes of the file on disk; generations move on every parse even when the overlay view doesn't
+_written_payload = None
+_export_write_lock = threading.Lock()
+
 def _export_json():
-    """Exports the current state to a JSON file."""
+    """Exports the current state to a JSON file.
+
+    Skipped when nothing has changed since the last export and the file is still there,
+    and the write is skipped when the serialized view matches what was written last.
+    The state is serialized under state_lock; the file write happens after releasing it.
+    """
+    global _last_export_key, _export_seq, _written_export_seq, _written_payload
+    with state_lock:
+        export_key = (*_state_gen.values(), id(expected_teams))
+        if export_key == _last_export_key and os.path.exists(OUTPUT_JSON):
+            return
+        payload = _export_payload()
+        if payload is None:
+            return
+        _export_seq += 1
+        seq = _export_seq
+        _last_export_key = export_key
+    with _export_write_lock:
+        if seq < _written_export_seq:
+            return
+        if payload == _written_payload and os.path.exists(OUTPUT_JSON):
+            _written_export_seq = seq
+            return
+        try:
+            _write_bytes(OUTPUT_JSON, payload)
+            _written_export_seq = seq
+            _written_payload = payload
+        except Exception as e:
+            _last_export_key = None  # Retry on the next export
+            logging.error(f"Error during JSON export: {e}")
+
+def _request_export():
+    """Export after a state transition without writing once per event.
+
+    While the sampler thread runs it is woken to export (bursts collapse into one
+    write); during catch-up the export is left to the live loop that follows.
+    """
+    if _sampler_active or in_catchup_processing:
+        export_event.set()
+    else:
+        _export_json()
+
+def _export_payload():
+    """Serialize the overlay view of the current state (None on error)."""
     try:
         # Calculate missing teams for current match
         missing_teams = _calculate_missing_teams()
@@ -1446,7 +1938,7 @@ def _export_json():
                 "winnerTeamId": state["current_match"]["winnerTeamId"],
                 "winnerTeamName": state["current_match"]["winnerTeamName"],
                 "eliminationOrder": state["current_match"]["eliminationOrder"],
-                "killFeed": state["current_match"]["killFeed"],
+                "killFeed": list(state["current_match"]["killFeed"]),
                 "teams": state["current_match"]["teams"],
                 "players": state["current_match"]["players"],
                 "missing_teams": missing_teams,
@@ -1458,23 +1950,42 @@ def _export_json():
             },
             "matches": state["matches"]
         }
-        with open(OUTPUT_JSON, "w") as f:
-            json.dump(data, f, indent=4)
+        # Overlays parse this file every poll; keep it compact
+        return _json_bytes(data, _JSON_INDENT)
     except Exception as e:
         logging.error(f"Error during JSON export: {e}")
+        return None
 
 def get_all_log_files(log_dir, exclude_live_log=True):
     """Get all log files in log_dir."""
-    if not log_dir.exists():
-        return []
     out = []
-    for item in log_dir.iterdir():
-        if item.is_file() and item.suffix == ".txt":
-            if exclude_live_log and item.name in ["simulated_live.txt"]:
-                continue
-            out.append(item)
+    try:
+        # DirEntry.is_file() comes from the directory listing, so no stat per entry
+        with os.scandir(log_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and os.path.splitext(entry.name)[1] == ".txt":
+                    if exclude_live_log and entry.name == "simulated_live.txt":
+                        continue
+                    out.append(Path(entry.path))
+    except FileNotFoundError:
+        return []
     return sorted(out)
 
+# log dir -> (directory st_mtime_ns, get_all_log_files result)
+_log_list_cache = {}
+
+def _cached_log_files(log_dir):
+    """get_all_log_files(log_dir), rescanned only when the directory's mtime changes."""
+    try:
+        mtime = os.stat(log_dir).st_mtime_ns
+    except OSError:
+        return []
+    cached = _log_list_cache.get(log_dir)
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, get_all_log_files(log_dir))
+        _log_list_cache[log_dir] = cached
+    return cached[1]
+
 def load_all_time_players():
     """Load all-time player data and processed game IDs."""
     if not ALL_TIME_PLAYERS_JSON.exists():
@@ -1483,29 +1994,29 @@ def load_all_time_players():
         return False
 
     try:
-        with open(ALL_TIME_PLAYERS_JSON, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(ALL_TIME_PLAYERS_JSON)
 
-            if not isinstance(data, dict) or "players" not in data:
-                logging.error(f"Invalid format in {ALL_TIME_PLAYERS_JSON}: missing 'players' key")
-                state["all_time"]["processed_game_ids"] = set()
-                return False
+        if not isinstance(data, dict) or "players" not in data:
+            logging.error(f"Invalid format in {ALL_TIME_PLAYERS_JSON}: missing 'players' key")
+            state["all_time"]["processed_game_ids"] = set()
+            return False
 
-            # Load players
-            state["all_time"]["players"] = data["players"]
+        # Load players
+        state["all_time"]["players"] = data["players"]
+        _bump_gen("all_time")
 
-            # Load processed game IDs (convert to set for fast lookup)
-            processed_ids = data.get("processed_game_ids", [])
-            if isinstance(processed_ids, list):
-                state["all_time"]["processed_game_ids"] = set(processed_ids)
-            else:
-                state["all_time"]["processed_game_ids"] = set()
+        # Load processed game IDs (convert to set for fast lookup)
+        processed_ids = data.get("processed_game_ids", [])
+        if isinstance(processed_ids, list):
+            state["all_time"]["processed_game_ids"] = set(processed_ids)
+        else:
+            state["all_time"]["processed_game_ids"] = set()
 
-            logging.info(
-                f"Loaded {len(state['all_time']['players'])} players and "
-                f"{len(state['all_time']['processed_game_ids'])} processed game IDs from {ALL_TIME_PLAYERS_JSON}"
-            )
-            return True
+        logging.info(
+            f"Loaded {len(state['all_time']['players'])} players and "
+            f"{len(state['all_time']['processed_game_ids'])} processed game IDs from {ALL_TIME_PLAYERS_JSON}"
+        )
+        return True
 
     except json.JSONDecodeError as e:
         logging.error(f"Error decoding JSON from {ALL_TIME_PLAYERS_JSON}: {e}")
@@ -1515,23 +2026,40 @@ def load_all_time_players():
     state["all_time"]["processed_game_ids"] = set()
     return False
 
-def debug_log_content(log_text, file_name="unknown"):
-    """Debug log file content to verify snapshot and player data presence."""
-    logging.debug(f"Debugging log content for {file_name} (length: {len(log_text)} bytes)")
-    snapshot_pattern = r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] POST /totalmessage'
-    snapshots = re.findall(snapshot_pattern, log_text)
-    logging.debug(f"Found {len(snapshots)} snapshots in {file_name}")
-    player_pattern = r'TotalPlayerList:.*?\uId'
-    player_matches = re.findall(player_pattern, log_text, re.DOTALL)
-    logging.debug(f"Found {len(player_matches)} TotalPlayerList entries in {file_name}")
-    if player_matches:
-        logging.debug(f"Sample TotalPlayerList entry: {player_matches[0][:200]}...")
-    if not snapshots or not player_matches:
-        logging.warning(f"No valid snapshots or player data in {file_name}")
-
-def save_all_time_players():
-    """Save all-time player data to JSON file with enhanced error handling and debugging."""
-    import shutil
+# Newest all-time save waiting to be written, as (payload, player count, game count)
+_all_time_pending = None
+_all_time_pending_lock = threading.Lock()
+# Held for a whole write so an older payload can never land after a newer one
+_all_time_write_lock = threading.Lock()
+_all_time_event = threading.Event()
+_all_time_writer = None
+
+def _flush_all_time_writes():
+    """Write the pending all-time save, if any."""
+    global _all_time_pending
+    with _all_time_write_lock:
+        with _all_time_pending_lock:
+            job, _all_time_pending = _all_time_pending, None
+        if job:
+            _store_all_time_bytes(*job)
+
+def _all_time_writer_loop():
+    """Background writer for save_all_time_players(background=True)."""
+    while True:
+        _all_time_event.wait()
+        _all_time_event.clear()
+        _flush_all_time_writes()
+
+atexit.register(_flush_all_time_writes)
+
+def save_all_time_players(background=False):
+    """Save all-time player data to JSON file with enhanced error handling and debugging.
+
+    The data is always serialized in the calling thread. With background=True the file
+    write is left to a writer thread, and a save that has not been written yet is replaced
+    by the newer one.
+    """
+    global _all_time_pending, _all_time_writer
     try:
         player_count = len(state["all_time"]["players"])
         
@@ -1549,7 +2077,36 @@ def save_all_time_players():
             logging.info(f"Sample game IDs being saved: {sample_ids}")
         else:
             logging.warning("No processed game IDs to save!")
+
+        # Prepare data with processed game IDs (convert set to sorted list for readability)
+        processed_ids_list = sorted(list(state["all_time"]["processed_game_ids"]))
+        save_data = {
+            "players": state["all_time"]["players"],
+            "processed_game_ids": processed_ids_list
+        }
         
+        logging.debug(f"Prepared save_data with {len(processed_ids_list)} game IDs")
+        payload = _json_bytes(save_data, _JSON_INDENT)
+    except Exception as e:
+        logging.error(f"Unexpected error in save_all_time_players: {e}")
+        import traceback
+        logging.error(traceback.format_exc())
+        return
+
+    with _all_time_pending_lock:
+        _all_time_pending = (payload, player_count, len(processed_ids_list))
+        if background and _all_time_writer is None:
+            _all_time_writer = threading.Thread(target=_all_time_writer_loop, name="all-time-writer", daemon=True)
+            _all_time_writer.start()
+    if background:
+        _all_time_event.set()
+    else:
+        _flush_all_time_writes()
+
+def _store_all_time_bytes(payload, player_count, game_count):
+    """Write serialized all-time data to ALL_TIME_PLAYERS_JSON via a temp file."""
+    import shutil
+    try:
         output_dir = Path(ALL_TIME_PLAYERS_JSON).parent
         logging.debug(f"Ensuring output directory exists: {output_dir}")
         output_dir.mkdir(parents=True, exist_ok=True)
@@ -1562,20 +2119,10 @@ def save_all_time_players():
         temp_file = ALL_TIME_PLAYERS_JSON.with_suffix('.json.tmp')
         logging.debug(f"Attempting to write to temporary file: {temp_file}")
 
-        # Prepare data with processed game IDs (convert set to sorted list for readability)
-        processed_ids_list = sorted(list(state["all_time"]["processed_game_ids"]))
-        save_data = {
-            "players": state["all_time"]["players"],
-            "processed_game_ids": processed_ids_list
-        }
-        
-        logging.debug(f"Prepared save_data with {len(processed_ids_list)} game IDs")
-
         # Write to temp file
         try:
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(save_data, f, indent=2, ensure_ascii=False)
-            logging.debug(f"Successfully wrote {player_count} players and {len(processed_ids_list)} game IDs to temp file {temp_file}")
+            temp_file.write_bytes(payload)
+            logging.debug(f"Successfully wrote {player_count} players and {game_count} game IDs to temp file {temp_file}")
         except Exception as e:
             logging.error(f"Failed to write to temp file {temp_file}: {e}")
             if temp_file.exists():
@@ -1595,21 +2142,13 @@ def save_all_time_players():
         import gc
         gc.collect()
 
-        # Remove target file if it exists (Windows compatibility)
-        if ALL_TIME_PLAYERS_JSON.exists():
-            try:
-                ALL_TIME_PLAYERS_JSON.unlink()
-                logging.debug(f"Removed existing {ALL_TIME_PLAYERS_JSON}")
-            except Exception as e:
-                logging.warning(f"Could not remove existing file: {e}")
-
-        # Attempt to rename (now that target is gone)
+        # os.replace swaps the file in atomically (also over an existing file on Windows)
         try:
-            temp_file.rename(ALL_TIME_PLAYERS_JSON)
-            logging.info(f"Successfully saved {ALL_TIME_PLAYERS_JSON} with {player_count} players and {len(processed_ids_list)} processed games")
+            os.replace(temp_file, ALL_TIME_PLAYERS_JSON)
+            logging.info(f"Successfully saved {ALL_TIME_PLAYERS_JSON} with {player_count} players and {game_count} processed games")
             return
         except OSError as e:
-            logging.error(f"Failed to rename {temp_file} to {ALL_TIME_PLAYERS_JSON}: {e}")
+            logging.error(f"Failed to replace {ALL_TIME_PLAYERS_JSON} with {temp_file}: {e}")
 
         # Fallback: Direct copy
         logging.warning(f"Attempting direct copy to {ALL_TIME_PLAYERS_JSON}")
@@ -1623,7 +2162,7 @@ def save_all_time_players():
                 temp_file.unlink(missing_ok=True)
 
     except Exception as e:
-        logging.error(f"Unexpected error in save_all_time_players: {e}")
+        logging.error(f"Unexpected error writing all-time players: {e}")
         import traceback
         logging.error(traceback.format_exc())
         # Clean up temp file on error
@@ -1634,55 +2173,36 @@ def save_all_time_players():
         except:
             pass
 
-def apply_archived_file_to_all_time(log_text, parsed_logos, file_name="unknown"):
-    """Apply archived log data to all-time player statistics."""
+def apply_archived_file_to_all_time(scan, parsed_logos, file_name="unknown"):
+    """Apply archived log data to all-time player statistics.
+
+    scan is the _scan_archive_file result for the file.
+    """
     global in_archive_processing
-    temp_before = state["current_match"].copy()
-    temp_mapping_before = state["teamNameMapping"].copy()
+    # Archived matches are parsed into fresh dicts; keep references to restore afterwards
+    saved_match = state["current_match"]
+    saved_mapping = state["teamNameMapping"]
+    saved_reverse = state["teamNameMapping_reverse"]
+    saved_pending = set(_phase_pending_players)
     in_archive_processing = True
     processed_players = 0
     start_time = time.time()
     try:
-        # Validate and debug log content
-        debug_log_content(log_text, file_name)
-        if not validate_log_content(log_text):
+        game_snapshots, total_snapshots, has_players = scan
+        logging.info(f"Found {total_snapshots} snapshots in {file_name}")
+        if not game_snapshots or not has_players:
             logging.error(f"Invalid or empty log content in {file_name}, skipping processing")
             return
 
-        # Read log in chunks to reduce memory usage
-        chunk_size = 1024 * 1024  # 1MB chunks
-        snapshots = []
-        buffer = ""
-        pos = 0
-        while pos < len(log_text):
-            chunk = log_text[pos:pos + chunk_size]
-            buffer += chunk
-            new_snapshots = extract_snapshots(buffer)
-            if new_snapshots:
-                snapshots.extend(new_snapshots[:-1])  # All but the last (may be incomplete)
-                buffer = new_snapshots[-1] if new_snapshots else ""
-            pos += chunk_size
-        if buffer:
-            snapshots.extend(extract_snapshots(buffer))  # Process remaining buffer
-        total_snapshots = len(snapshots)
-        logging.info(f"Found {total_snapshots} snapshots in {file_name}")
-
-        # Group last snapshot per game_id
-        game_snapshots = {}
-        for i, snap in enumerate(snapshots):
-            gid_match = re.search(r"GameID:\s*['\"]?(\d+)['\"]?", snap)
-            game_id = gid_match.group(1) if gid_match else f"unknown_{i}"
-            game_snapshots[game_id] = snap
-            if (i + 1) % 100 == 0:  # Progress update every 100 snapshots
-                print_progress_bar(i + 1, total_snapshots, prefix="Snapshots Scanned", suffix=f"{file_name}")
-
         total_matches = len(game_snapshots)
         logging.info(f"Detected {total_matches} unique matches in {file_name}")
 
+        all_time_players = state["all_time"]["players"]
+        processed_ids = state["all_time"].setdefault("processed_game_ids", set())
         match_count = 0
         for game_id, last_snap in game_snapshots.items():
             # Skip if already processed in all_time
-            if game_id in state["all_time"].get("processed_game_ids", set()):
+            if game_id in processed_ids:
                 logging.info(f"Skipping archived match {game_id}, already processed in all_time.")
                 continue
 
@@ -1690,20 +2210,13 @@ def apply_archived_file_to_all_time(log_text, parsed_logos, file_name="unknown")
                 logging.info(f"Shutdown requested during processing of {file_name}. Stopping.")
                 break
             # Reset state for each match
-            state["current_match"] = {
-                "id": None,
-                "status": "idle",
-                "winnerTeamId": None,
-                "winnerTeamName": None,
-                "eliminationOrder": [],
-                "killFeed": [],
-                "teams": {},
-                "players": {}
-            }
+            state["current_match"] = _fresh_match_dict()
+            _phase_pending_players.clear()
             state["teamNameMapping"] = {}
+            state["teamNameMapping_reverse"] = {}
 
             process_snapshot(last_snap, parsed_logos)
-            logging.debug(f"Processed snapshot for game {game_id}, current_match players: {len(state['current_match']['players'])}")
+            logging.debug("Processed snapshot for game %s, current_match players: %d", game_id, len(state["current_match"]["players"]))
 
             # Update all-time stats
             for pid, pl in state["current_match"]["players"].items():
@@ -1711,25 +2224,29 @@ def apply_archived_file_to_all_time(log_text, parsed_logos, file_name="unknown")
                     logging.warning(f"Skipping invalid player ID in match {game_id}")
                     continue
                 team_name = _get_team_name_by_id(pl.get("teamId")) or "Unknown Team"
-                player_photo = get_player_photo_url(pid, pl.get("photo", DEFAULT_PLAYER_PHOTO))
-                at = state["all_time"]["players"].setdefault(pid, {
-                    "id": pid,
-                    "name": pl.get("name", "Unknown Player"),
-                    "teamName": team_name,
-                    "photo": player_photo,
-                    "totals": {"kills": 0, "damage": 0, "knockouts": 0, "matches": 0}
-                })
+                at = all_time_players.get(pid)
+                if at is None:
+                    # Photo is resolved below; one lookup per player instead of two
+                    at = all_time_players[pid] = {
+                        "id": pid,
+                        "name": pl.get("name", "Unknown Player"),
+                        "teamName": team_name,
+                        "photo": DEFAULT_PLAYER_PHOTO,
+                        "totals": {"kills": 0, "damage": 0, "knockouts": 0, "matches": 0}
+                    }
                 at["name"] = pl.get("name", at["name"])
                 at["photo"] = get_player_photo_url(pid, pl.get("photo", at.get("photo")))
                 at["teamName"] = team_name
-                at["totals"]["kills"] += int(pl["stats"].get("kills", 0))
-                at["totals"]["damage"] += int(pl["stats"].get("damage", 0))
-                at["totals"]["knockouts"] += int(pl["stats"].get("knockouts", 0))
-                at["totals"]["matches"] += 1
+                totals = at["totals"]
+                stats = pl["stats"]
+                totals["kills"] += int(stats.get("kills", 0))
+                totals["damage"] += int(stats.get("damage", 0))
+                totals["knockouts"] += int(stats.get("knockouts", 0))
+                totals["matches"] += 1
                 processed_players += 1
-                logging.debug(f"Updated all-time stats for player {pid} in match {game_id}: {at['totals']}")
+                logging.debug("Updated all-time stats for player %s in match %s: %s", pid, game_id, totals)
             # Mark this game_id as processed
-            state["all_time"].setdefault("processed_game_ids", set()).add(game_id)
+            processed_ids.add(game_id)
             match_count += 1
             print_progress_bar(match_count, total_matches, prefix="Matches", suffix=f"{file_name}")
 
@@ -1745,23 +2262,46 @@ def apply_archived_file_to_all_time(log_text, parsed_logos, file_name="unknown")
         logging.error(f"Error processing archived log {file_name}: {e}")
     finally:
         in_archive_processing = False
-        state["current_match"].update(temp_before)
-        state["teamNameMapping"] = temp_mapping_before
-
-def validate_log_content(log_text):
-    """Validate that the log text contains valid snapshot data."""
-    if not log_text or not isinstance(log_text, str):
-        logging.error("Log text is empty or invalid")
-        return False
-    snapshot_pattern = r'\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\] POST /totalmessage'
-    if not re.search(snapshot_pattern, log_text):
-        logging.error("No valid snapshots found in log text")
-        return False
-    player_pattern = r'TotalPlayerList:.*?\uId'
-    if not re.search(player_pattern, log_text, re.DOTALL):
-        logging.warning("No player data found in log text")
-        return False
-    return True
+        state["current_match"] = saved_match
+        state["teamNameMapping"] = saved_mapping
+        state["teamNameMapping_reverse"] = saved_reverse
+        _phase_pending_players.clear()
+        _phase_pending_players.update(saved_pending)
+        _bump_gen()
+
+def _scan_archive_file(path):
+    """Stream an archived log and keep the last snapshot of every game.
+
+    Returns (game ID -> last snapshot text, snapshot count, whether any player data was
+    seen). Only the snapshot still being read and one snapshot per game are held, so
+    memory does not grow with the file size.
+    """
+    game_snapshots = {}
+    count = 0
+    has_players = False
+    tail = ""
+    with open(path, "r", encoding="utf-8") as fh:
+        while True:
+            chunk = fh.read(ARCHIVE_CHUNK_SIZE)
+            if chunk:
+                tail += chunk
+                snapshots = extract_snapshots(tail)
+                if not snapshots:
+                    # Keep enough text for a header split across two reads
+                    tail = tail[-64:]
+                    continue
+                # The last snapshot may continue in the next read
+                tail = snapshots.pop()
+            else:
+                snapshots = extract_snapshots(tail)
+            for snap in snapshots:
+                gid_match = GAME_ID.search(snap)
+                game_snapshots[gid_match.group(1) if gid_match else f"unknown_{count}"] = snap
+                has_players = has_players or PLAYER_LIST_ENTRY.search(snap) is not None
+                count += 1
+            if not chunk:
+                break
+    return game_snapshots, count, has_players
 
 def process_archives_for_all_time(parsed_logos, force_repopulate=False):
     """Process archived logs for all-time player statistics."""
@@ -1770,6 +2310,7 @@ def process_archives_for_all_time(parsed_logos, force_repopulate=False):
         return
     if force_repopulate:
         state["all_time"]["players"] = {}
+        _bump_gen("all_time")
         logging.info("Force repopulating all-time players")
     print_colored("Processing archived logs for all-time player statistics...", Fore.CYAN)
     archived_logs = get_all_log_files(ARCHIVE_LOG_DIR, exclude_live_log=False)
@@ -1780,26 +2321,33 @@ def process_archives_for_all_time(parsed_logos, force_repopulate=False):
     print_colored(f"Found {len(archived_logs)} archived logs to process.", Fore.WHITE)
     total_file_size = sum(f.stat().st_size for f in archived_logs)
     processed_size = 0
-    for i, f in enumerate(archived_logs):
-        if check_shutdown_conditions():
-            logging.info("Shutdown requested during archive processing. Stopping.")
-            break
-        file_size = f.stat().st_size
-        print_colored(f"\nProcessing archive file {i+1}/{len(archived_logs)}: {f.name}", Fore.YELLOW)
-        try:
-            with open(f, "r", encoding="utf-8") as fh:
-                log_text = fh.read()
-                apply_archived_file_to_all_time(log_text, parsed_logos, file_name=f.name)
+    # Files are streamed and scanned on worker threads; parsing and merging stay on this
+    # thread so state needs no locking
+    with ThreadPoolExecutor(max_workers=ARCHIVE_READ_AHEAD) as executor:
+        reads = deque(executor.submit(_scan_archive_file, f) for f in archived_logs[:ARCHIVE_READ_AHEAD])
+        for i, f in enumerate(archived_logs):
+            read = reads.popleft()
+            if i + ARCHIVE_READ_AHEAD < len(archived_logs):
+                reads.append(executor.submit(_scan_archive_file, archived_logs[i + ARCHIVE_READ_AHEAD]))
+            if check_shutdown_conditions():
+                logging.info("Shutdown requested during archive processing. Stopping.")
+                for pending in reads:
+                    pending.cancel()
+                break
+            file_size = f.stat().st_size
+            print_colored(f"\nProcessing archive file {i+1}/{len(archived_logs)}: {f.name}", Fore.YELLOW)
+            try:
+                apply_archived_file_to_all_time(read.result(), parsed_logos, file_name=f.name)
                 processed_size += file_size
                 print_progress_bar(processed_size, total_file_size, 
                                    prefix=f"Archive {i+1}/{len(archived_logs)}", 
                                    suffix=f"{f.name} complete")
-        except Exception as e:
-            logging.error(f"Error processing archive file {f.name}: {e}")
-            processed_size += file_size
-            print_progress_bar(processed_size, total_file_size, 
-                               prefix=f"Archive {i+1}/{len(archived_logs)}", 
-                               suffix=f"{f.name} ERROR")
+            except Exception as e:
+                logging.error(f"Error processing archive file {f.name}: {e}")
+                processed_size += file_size
+                print_progress_bar(processed_size, total_file_size, 
+                                   prefix=f"Archive {i+1}/{len(archived_logs)}", 
+                                   suffix=f"{f.name} ERROR")
     print_progress_bar(total_file_size, total_file_size, prefix="Archive", suffix="PROCESSING COMPLETE")
     save_all_time_players()
     print_colored(f"All-time processing complete. Saved {len(state['all_time']['players'])} players.", Fore.GREEN)
@@ -1811,10 +2359,9 @@ def confirm_file_setup():
     print_colored("="*60, Fore.CYAN)
     if ALL_TIME_PLAYERS_JSON.exists():
         try:
-            with open(ALL_TIME_PLAYERS_JSON, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                player_count = len(data.get("players", {}))
-                print_colored(f"✓ Found all_time_players.json with {player_count} players", Fore.GREEN)
+            data = _read_json(ALL_TIME_PLAYERS_JSON)
+            player_count = len(data.get("players", {}))
+            print_colored(f"✓ Found all_time_players.json with {player_count} players", Fore.GREEN)
         except Exception as e:
             print_colored(f"⚠ Found all_time_players.json but couldn't read it: {e}", Fore.YELLOW)
     else:
@@ -1850,17 +2397,40 @@ def confirm_file_setup():
 
 def _file_size(path):
     """Returns the file size in bytes."""
-    return os.stat(path).st_size if os.path.exists(path) else 0
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+# Live log kept open between reads; reopened only when the live log path changes
+_live_file = None
+_live_path = None
+
+def _close_live_log():
+    """Close the live log file kept open by _read_new."""
+    global _live_file, _live_path
+    if _live_file is not None:
+        try:
+            _live_file.close()
+        except OSError:
+            pass
+    _live_file = None
+    _live_path = None
 
 def _read_new(path: Path, pos: int):
     """Read new content from file starting at position."""
+    global _live_file, _live_path
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            f.seek(pos)
-            data = f.read()
-            return data, f.tell()
+        if _live_file is None or _live_path != path:
+            _close_live_log()
+            _live_file = open(path, "r", encoding="utf-8")
+            _live_path = path
+        _live_file.seek(pos)
+        data = _live_file.read()
+        return data, _live_file.tell()
     except Exception as e:
         logging.warning(f"Read error: {e}")
+        _close_live_log()
         return "", pos
 
 def _is_log_updating(log_path, min_size=0):
@@ -1875,8 +2445,35 @@ def _is_log_updating(log_path, min_size=0):
     except Exception:
         return False
 
+def _start_file_watcher(directory, patterns, *events):
+    """Set events whenever a file matching patterns is created, modified or moved into directory.
+
+    Returns the running watchdog observer, or None when watchdog is unavailable
+    (callers then fall back to polling).
+    """
+    if not WATCHDOG_AVAILABLE:
+        return None
+    handler = PatternMatchingEventHandler(patterns=patterns, ignore_directories=True)
+    def notify(_event):
+        for event in events:
+            event.set()
+    handler.on_created = handler.on_modified = handler.on_moved = notify
+    observer = Observer()
+    observer.daemon = True
+    try:
+        observer.schedule(handler, str(directory), recursive=False)
+        observer.start()
+    except Exception as e:
+        logging.warning(f"Could not watch {directory}, falling back to polling: {e}")
+        return None
+    return observer
+
 def force_end_listener():
     """Listen for force end commands in a background thread."""
+    # Reuse the watcher check_shutdown_conditions started, if any
+    flag_watcher = None if _flag_watcher else _start_file_watcher(Path("."), _FLAG_PATTERNS, flag_event, listener_flag_event)
+    # With a watcher the wait returns as soon as a flag appears; the timeout is only a safety net
+    flag_wait = 10 if (_flag_watcher or flag_watcher) else 1
     while True:
         try:
             force_end_file = Path("force_end.flag")
@@ -1894,10 +2491,13 @@ def force_end_listener():
                 with finalization_lock:
                     complete_shutdown_requested = True
                 break
-            time.sleep(1)
+            listener_flag_event.wait(flag_wait)
+            listener_flag_event.clear()
         except Exception as e:
             logging.error(f"Error in force end listener: {e}")
             break
+    if flag_watcher:
+        flag_watcher.stop()
 
 def setup_force_end_thread():
     """Setup a background thread to listen for force end commands."""
@@ -1914,7 +2514,7 @@ def server_only_mode():
     print_colored("="*60, Fore.MAGENTA)
     print_colored("\nOverlay data will show the final phase standings", Fore.CYAN)
     print_colored("Create 'force_shutdown.flag' file or press Ctrl+C to exit completely\n", Fore.WHITE)
-    last_json_export = 0
+    last_json_export = float("-inf")
     try:
         while True:
             if should_shutdown():
@@ -1925,7 +2525,7 @@ def server_only_mode():
                 print_colored("Force shutdown flag detected", Fore.RED)
                 force_shutdown_file.unlink()
                 break
-            now = time.time()
+            now = time.monotonic()
             if now - last_json_export >= 10:
                 try:
                     _export_json()
@@ -1938,9 +2538,10 @@ def server_only_mode():
     print_colored("Shutting down web server...", Fore.YELLOW)
 
 def request_finalization():
-    """Thread-safe way to request finalization."""
-    if state["current_match"]["status"] in ["live", "finished"]:
-        end_match_and_update_phase()
+    """Thread-safe way to request finalization.
+
+    Only sets the flag; the main thread finalizes the match when it sees it.
+    """
     global finalization_requested
     with finalization_lock:
         finalization_requested = True
@@ -1959,6 +2560,7 @@ def should_shutdown():
 
 def perform_finalization(keep_server_running=True):
     """Perform the actual finalization logic."""
+    global finalization_requested
     if state["current_match"]["status"] in ["live", "finished"]:
         end_match_and_update_phase()
     print_colored("\nPerforming finalization...", Fore.CYAN, Style.BRIGHT)
@@ -1994,6 +2596,7 @@ def signal_handler(signum, frame):
         complete_shutdown_requested = True
         finalization_requested = True
     shutdown_event.set()
+    log_event.set()  # Wake the live loop if it is waiting for log changes
 
 def setup_signal_handlers():
     """Setup enhanced signal handlers for graceful shutdown."""
@@ -2004,12 +2607,45 @@ def setup_signal_handlers():
     if hasattr(signal, 'SIGQUIT'):
         signal.signal(signal.SIGQUIT, signal_handler)
 
+_FLAG_PATTERNS = ["*force_end.flag", "*force_shutdown.flag"]
+_flag_watcher = None  # Observer behind check_shutdown_conditions; False if it couldn't start
+_flag_dir_mtime = None  # Settled mtime of "." with no flag files present (polling fallback)
+_FLAG_DIR_SETTLE_NS = 2_000_000_000  # Younger mtimes may still hide a same-tick change
+
+def _flag_files_may_exist():
+    """Whether check_shutdown_conditions needs to look for the flag files.
+
+    With watchdog, the files are only stat'ed after the watcher reports activity
+    (and once when it starts). Without it, creating a flag file changes the
+    directory's mtime, so one stat of "." stands in for both files while it is unchanged.
+    """
+    global _flag_watcher, _flag_dir_mtime
+    if _flag_watcher is None:
+        _flag_watcher = _start_file_watcher(Path("."), _FLAG_PATTERNS, flag_event, listener_flag_event) or False
+        return True
+    if _flag_watcher:
+        if flag_event.is_set():
+            flag_event.clear()
+            return True
+        return False
+    try:
+        mtime = os.stat(".").st_mtime_ns
+    except OSError:
+        return True
+    if mtime == _flag_dir_mtime:
+        return False
+    # Only trust an mtime once it is old enough that coarse timestamps can't mask a later change
+    _flag_dir_mtime = mtime if time.time_ns() - mtime > _FLAG_DIR_SETTLE_NS else None
+    return True
+
 def check_shutdown_conditions():
     """Check all possible shutdown conditions."""
     if shutdown_event.is_set():
         return True
     if should_finalize():
         return True
+    if not _flag_files_may_exist():
+        return False
     force_end_file = Path("force_end.flag")
     if force_end_file.exists():
         print_colored("Force end flag detected. Requesting finalization...", Fore.RED)
@@ -2035,14 +2671,16 @@ def check_shutdown_conditions():
 
 def interruptible_sleep(duration, check_interval=0.1):
     """Sleep that can be interrupted by shutdown signals."""
-    end_time = time.time() + duration
-    while time.time() < end_time:
+    end_time = time.monotonic() + duration
+    while True:
+        remaining = end_time - time.monotonic()
+        if remaining <= 0:
+            break
         if check_shutdown_conditions():
             return True
-        remaining = end_time - time.time()
-        sleep_time = min(check_interval, remaining)
-        if sleep_time > 0:
-            time.sleep(sleep_time)
+        # A signal sets shutdown_event, which ends the wait straight away
+        if shutdown_event.wait(min(check_interval, remaining)):
+            return True
     return False
 
 def process_with_shutdown_check(log_files_to_process, parsed_logos):
@@ -2184,18 +2822,85 @@ def process_with_shutdown_check(log_files_to_process, parsed_logos):
     print_progress_bar(total_file_size, total_file_size, prefix="Catch-up", suffix="ALL FILES COMPLETE")
     return None, 0
 
+@contextlib.contextmanager
+def _profiled(suffix=""):
+    """Profile the enclosed block with cProfile when PROFILE_OUTPUT is set.
+
+    Stats go to PROFILE_OUTPUT + suffix (one file per thread, since cProfile
+    only sees the thread it was enabled on).
+    """
+    if not PROFILE_OUTPUT:
+        yield
+        return
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        path = f"{PROFILE_OUTPUT}{suffix}"
+        try:
+            profiler.dump_stats(path)
+            logging.info(f"Profile written to {path}")
+        except OSError as e:
+            logging.error(f"Could not write profile {path}: {e}")
+
+def _snapshot_sampler(test_mode, stop_event):
+    """Export JSON every UPDATE_INTERVAL and redraw the terminal every second until stop_event is set.
+
+    export_event requests an export ahead of schedule. Between matches the terminal
+    is only redrawn when the state has changed.
+    """
+    global _sampler_active
+    _sampler_active = True
+    next_json = next_term = time.monotonic()
+    drawn_gen = None
+    try:
+        with _profiled(".sampler"):
+            while not stop_event.is_set():
+                now = time.monotonic()
+                if export_event.is_set() or now >= next_json:
+                    export_event.clear()
+                    _export_json()
+                    next_json = now + UPDATE_INTERVAL
+                if now >= next_term:
+                    gen = tuple(_state_gen.values())
+                    if test_mode or gen != drawn_gen or state["current_match"]["status"] == "live":
+                        try:
+                            _print_terminal_snapshot(test_mode)
+                        except Exception as e:
+                            logging.error(f"Error drawing terminal snapshot: {e}")
+                        drawn_gen = gen
+                    next_term = now + 1.0
+                export_event.wait(max(0.0, min(next_json, next_term) - time.monotonic()))
+    finally:
+        _sampler_active = False
+
+def _stop_sampler(thread, stop_event):
+    """Stop a _snapshot_sampler thread and wait for it to exit."""
+    stop_event.set()
+    export_event.set()  # Wake it from its wait
+    thread.join()
+
 def enhanced_main_loop(test_mode=False, team_logos=None, live_log_path=None, start_pos=0):
     """Enhanced main loop with proper shutdown handling, integrating live tailing if provided."""
     global buffer
     buffer = ''
     current_log_path = live_log_path  # Use the live path from catch-up if available
     last_pos = start_pos if live_log_path else 0
-    last_json = 0
-    last_term = 0
     MATCH_CHECK_INTERVAL = 0.1
+    IDLE_POLL_MAX = 1.0  # Longest poll interval once the log has gone quiet
+    IDLE_TICKS_BEFORE_BACKOFF = 5
+    HELD_SNAPSHOT_FLUSH_DELAY = 1.0  # Quiet time after which the held-back snapshot is complete
+    LOG_RESCAN_INTERVAL = 5.0  # With a watcher, the log folder is still rescanned this often
+    poll_sleep = MATCH_CHECK_INTERVAL
+    idle_ticks = 0
+    next_poll = time.monotonic()  # Deadline of the next poll, so loop work doesn't stretch the period
     no_data_timeout = 5 if test_mode else 30
-    last_data_time = time.time()
-    last_warning_time = 0
+    # Interval timers use the monotonic clock so wall-clock adjustments can't fire them early or late
+    last_data_time = time.monotonic()
+    last_warning_time = float("-inf")
     WARNING_INTERVAL = 60
     current_phase_logs = get_all_log_files(CURRENT_LOG_DIR)
     if not current_log_path and current_phase_logs:
@@ -2203,68 +2908,116 @@ def enhanced_main_loop(test_mode=False, team_logos=None, live_log_path=None, sta
         last_pos = current_log_path.stat().st_size
         print_colored(f"✓ Live monitoring started on: {current_log_path.name}", Fore.GREEN)
     print_colored(f"\nStarting live monitoring... (Press Ctrl+C to stop)", Fore.CYAN, Style.BRIGHT)
+    # With a watcher, events wake the loop early; every wake still stats the log, since
+    # appends from a writer that keeps the file open (and overflowed event buffers) can go
+    # unreported on Windows. The folder is rescanned on events or every LOG_RESCAN_INTERVAL.
+    log_watcher = _start_file_watcher(CURRENT_LOG_DIR, ["*.txt"], log_event)
+    last_rescan = float("-inf")
+    # JSON export and terminal refresh run on their own thread so their I/O never delays ingestion
+    sampler_stop = threading.Event()
+    sampler = threading.Thread(target=_snapshot_sampler, args=(test_mode, sampler_stop), daemon=True)
+    sampler.start()
     try:
         while not check_shutdown_conditions():
-            now = time.time()
-            if state["current_match"]["status"] == "live" and state["current_match"]["id"]:
-                alive_teams = [t for t in state["current_match"]["teams"].values() if t["liveMembers"] > 0]
-                if len(alive_teams) <= 1:
-                    logging.info(f"LIVE: Match end detected. Finalizing match ID: {state['current_match']['id']}")
-                    end_match_and_update_phase()
-                    buffer = ''
-                    continue
-            log_was_updated = False
-            if current_log_path and current_log_path.exists():
-                size = _file_size(current_log_path)
-                if size > last_pos:
-                    chunk, new_pos = _read_new(current_log_path, last_pos)
-                    if chunk:
-                        old_buffer_len = len(buffer)
-                        parse_and_apply(chunk, parsed_logos=team_logos, mode="chunk")
-                        last_pos = new_pos
-                        log_was_updated = True
-                        last_data_time = now
-                        logging.debug(f"LIVE: Processed {len(chunk)} bytes (buffer: {old_buffer_len} -> {len(buffer)})")
-                else:
-                    if now - last_data_time > no_data_timeout and state["current_match"]["status"] == "live":
-                        alive_teams = [t for t in state["current_match"]["teams"].values() if t["liveMembers"] > 0]
-                        if len(alive_teams) <= 1:
-                            logging.info(f"LIVE: No new data for {no_data_timeout}s and match ended - forcing finalization of match {state['current_match']['id']}")
+            with state_lock:
+                now = time.monotonic()
+                # However many change events fired since the last pass, they're handled as one:
+                # clearing before the read lets writes made during parsing wake the next pass,
+                # and _read_new returns everything appended since last_pos in a single call
+                log_changed = log_watcher is None or log_event.is_set()
+                if log_changed:
+                    log_event.clear()
+                rescan_logs = log_changed or now - last_rescan >= LOG_RESCAN_INTERVAL
+                # Parsing or finalizing may swap in a new current_match; match is only read before that
+                match = state["current_match"]
+                match_live = match["status"] == "live"
+                if match_live and match["id"]:
+                    if match["_aliveTeams"] <= 1:
+                        logging.info("LIVE: Match end detected. Finalizing match ID: %s", match["id"])
+                        # Apply the held-back snapshot first; it may carry the final stats
+                        # (and finalize the match itself)
+                        if buffer:
+                            parse_and_apply('', parsed_logos=team_logos, mode="chunk")
+                        if state["current_match"] is match and match["status"] == "live":
                             end_match_and_update_phase()
-                            buffer = ''
+                        continue
+                log_was_updated = False
+                if current_log_path and current_log_path.exists():
+                    size = _file_size(current_log_path)
+                    if size > last_pos:
+                        chunk, new_pos = _read_new(current_log_path, last_pos)
+                        if chunk:
+                            old_buffer_len = len(buffer)
+                            parse_and_apply(chunk, parsed_logos=team_logos, mode="chunk")
+                            last_pos = new_pos
+                            log_was_updated = True
                             last_data_time = now
-                        else:
-                            if now - last_warning_time > WARNING_INTERVAL:
-                                logging.warning(f"LIVE: No new data for {now - last_data_time:.1f}s but {len(alive_teams)} teams still alive - waiting for more data to complete match {state['current_match']['id']}")
-                                last_warning_time = now
-            all_current_logs = get_all_log_files(CURRENT_LOG_DIR)
-            if all_current_logs and all_current_logs[-1] != current_log_path:
-                print_colored(f"\nNew live log detected: {all_current_logs[-1].name}", Fore.YELLOW)
-                buffer = ''
-                current_log_path = all_current_logs[-1]
-                last_pos = 0
-                log_was_updated = True
-                last_data_time = now
-            
-            if now - last_json >= UPDATE_INTERVAL:
-                _export_json()
-                last_json = now
-            
-            if now - last_term >= 1.0:
-                _print_terminal_snapshot(test_mode)
-                last_term = now
-            
-            if interruptible_sleep(MATCH_CHECK_INTERVAL):
-                break
+                            logging.debug("LIVE: Processed %d bytes (buffer: %d -> %d)", len(chunk), old_buffer_len, len(buffer))
+                    else:
+                        if buffer and now - last_data_time > HELD_SNAPSHOT_FLUSH_DELAY:
+                            # The writer has gone quiet, so the held-back snapshot is complete
+                            parse_and_apply('', parsed_logos=team_logos, mode="chunk")
+                            match = state["current_match"]
+                            match_live = match["status"] == "live"
+                        if match_live and now - last_data_time > no_data_timeout:
+                            alive_teams = match["_aliveTeams"]
+                            if alive_teams <= 1:
+                                logging.info("LIVE: No new data for %ss and match ended - forcing finalization of match %s", no_data_timeout, match["id"])
+                                end_match_and_update_phase()
+                                last_data_time = now
+                            else:
+                                if now - last_warning_time > WARNING_INTERVAL:
+                                    logging.warning("LIVE: No new data for %.1fs but %d teams still alive - waiting for more data to complete match %s", now - last_data_time, alive_teams, match["id"])
+                                    last_warning_time = now
+                all_current_logs = None
+                if rescan_logs:
+                    all_current_logs = _cached_log_files(CURRENT_LOG_DIR)
+                    last_rescan = now
+                if all_current_logs and all_current_logs[-1] != current_log_path:
+                    print_colored(f"\nNew live log detected: {all_current_logs[-1].name}", Fore.YELLOW)
+                    # The old log is finished; apply its held-back snapshot before switching
+                    if buffer:
+                        parse_and_apply('', parsed_logos=team_logos, mode="chunk")
+                    current_log_path = all_current_logs[-1]
+                    last_pos = 0
+                    log_was_updated = True
+                    last_data_time = now
+
+            if log_watcher is not None:
+                # Wake on the next log change; the timeout is the polling fallback and keeps
+                # shutdown / no-data checks running (idle waits are longer)
+                if log_event.wait(MATCH_CHECK_INTERVAL * 5 if match_live else IDLE_POLL_MAX):
+                    # Give the writer a moment to finish its burst so snapshots aren't read half-written
+                    time.sleep(MATCH_CHECK_INTERVAL)
+            else:
+                # Poll fast while data is flowing, back off while the log is idle
+                if log_was_updated:
+                    idle_ticks = 0
+                    poll_sleep = MATCH_CHECK_INTERVAL
+                elif not match_live:
+                    # No match running: go straight to the slow rate
+                    poll_sleep = IDLE_POLL_MAX
+                else:
+                    idle_ticks += 1
+                    if idle_ticks > IDLE_TICKS_BEFORE_BACKOFF:
+                        poll_sleep = min(poll_sleep * 2, IDLE_POLL_MAX)
+                next_poll += poll_sleep
+                remaining = next_poll - time.monotonic()
+                if remaining < -poll_sleep:
+                    # Fell more than a tick behind: resync instead of polling in a burst
+                    next_poll = time.monotonic() + poll_sleep
+                    remaining = poll_sleep
+                if interruptible_sleep(remaining):
+                    break
                 
     except KeyboardInterrupt:
         print_colored("\nKeyboard interrupt received", Fore.YELLOW)
+        _stop_sampler(sampler, sampler_stop)
         if buffer:
             logging.info(f"LIVE: Flushing final {len(buffer)} bytes from buffer on exit")
             parse_and_apply('', parsed_logos=team_logos, mode="chunk")
         if state["current_match"]["status"] == "live" and state["current_match"]["id"]:
-            alive_teams = [t for t in state["current_match"]["teams"].values() if t["liveMembers"] > 0]
-            if len(alive_teams) <= 1:
+            if state["current_match"]["_aliveTeams"] <= 1:
                 logging.info("Force finalizing on interrupt (match ended)")
                 end_match_and_update_phase()
                 _finalize_and_persist()
@@ -2273,6 +3026,7 @@ def enhanced_main_loop(test_mode=False, team_logos=None, live_log_path=None, sta
         buffer = ''
     except Exception as e:
         logging.exception(f"Live monitor error: {e}")
+        _stop_sampler(sampler, sampler_stop)
         if buffer:
             logging.info(f"LIVE: Flushing {len(buffer)} bytes from buffer due to error")
             parse_and_apply('', parsed_logos=team_logos, mode="chunk")
@@ -2281,6 +3035,11 @@ def enhanced_main_loop(test_mode=False, team_logos=None, live_log_path=None, sta
             end_match_and_update_phase()
             _finalize_and_persist()
             buffer = ''
+    finally:
+        _stop_sampler(sampler, sampler_stop)
+        _close_live_log()
+        if log_watcher:
+            log_watcher.stop()
     
     print_colored("Exiting main monitoring loop...", Fore.YELLOW)
 
@@ -2288,6 +3047,8 @@ def main(test_mode=False, reprocess=False):
     """Main function to run the live monitor with enhanced finalization."""
     global simulation_manager, expected_teams, buffer
 
+    setup_logging()
+
     # Setup signal handlers for graceful shutdown
     setup_signal_handlers()
 
@@ -2376,7 +3137,8 @@ def main(test_mode=False, reprocess=False):
         else:
             print_colored(f"Monitoring live log: {live_log_path.name if live_log_path else 'None'}", Fore.GREEN)
 
-        enhanced_main_loop(test_mode=test_mode, team_logos=team_logos, live_log_path=live_log_path, start_pos=start_pos)
+        with _profiled():
+            enhanced_main_loop(test_mode=test_mode, team_logos=team_logos, live_log_path=live_log_path, start_pos=start_pos)
 
     except KeyboardInterrupt:
         print_colored("\nStopped by user (Ctrl+C).", Fore.YELLOW)